@@ -0,0 +1,67 @@
+"""Speedup of sharded ``cluster_items`` across worker counts.
+
+Usage: python benchmarks/cluster_scaling.py --items 20000 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from news.cluster import cluster_items
+from news.models import NewsItem
+
+
+def synthetic_items(count: int, *, topics: int, seed: int = 7) -> list[NewsItem]:
+    """Items drawn from ``topics`` word pools plus shared noise words."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(4, 9)))
+
+    pools = [[word() for _ in range(12)] for _ in range(topics)]
+    noise = [word() for _ in range(5000)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for idx in range(count):
+        pool = pools[rng.randrange(topics)]
+        title = " ".join(rng.sample(pool, 6))
+        summary = " ".join(rng.sample(pool, 6) + rng.choices(noise, k=20))
+        items.append(
+            NewsItem(
+                id=str(idx),
+                title=title,
+                link=f"https://example.com/{idx}",
+                source="bench",
+                published_dt=start + timedelta(minutes=idx),
+                summary=summary,
+            )
+        )
+    return items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    items = synthetic_items(args.items, topics=args.topics)
+    print(f"{args.items} items, {args.topics} topics, threshold {args.threshold}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8} {'clusters':>9}")
+    baseline: float | None = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        clusters = cluster_items(items, similarity_threshold=args.threshold, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {len(clusters):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Per-stage cost of text analysis with and without the per-item memo.
+
+"recompute" reproduces what each stage did on its own before the shared
+text layer (regex title split in dedupe and again when the dedupe index
+remembers kept items, text_blob().lower() per keyword filter, per-delimiter
+str.replace tokenizing in cluster); "memoized" runs the same stages in
+pipeline order on NewsItem.features(), so later stages reuse what earlier
+ones computed. The memo keeps every item's token counts alive, which costs
+some allocator/GC time in the cluster stage.
+
+Usage: python benchmarks/text_stages.py --items 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from typing import Callable
+
+from news.models import NewsItem
+from news.text import STOPWORDS, TOKEN_DELIMS
+
+INCLUDE = ("chip", "storm")
+EXCLUDE = ("sponsored",)
+
+
+def synthetic_items(count: int, seed: int = 11) -> list[NewsItem]:
+    rng = random.Random(seed)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(4000)]
+    words += ["chip", "storm", "sponsored"]
+    return [
+        NewsItem(
+            id=str(idx),
+            title=" ".join(rng.choices(words, k=9)).title(),
+            link=f"https://example.com/{idx}",
+            source="bench",
+            summary=" ".join(rng.choices(words, k=60)) + ".",
+            content=" ".join(rng.choices(words, k=200)) + "." if idx % 2 else None,
+        )
+        for idx in range(count)
+    ]
+
+
+def _old_normalize_title(title: str) -> str:
+    tokens = re.split(r"[^a-zA-Z0-9]+", title.lower())
+    cleaned = []
+    for token in tokens:
+        if not token or token in STOPWORDS:
+            continue
+        if token.endswith("s") and len(token) > 3:
+            token = token[:-1]
+        cleaned.append(token)
+    cleaned.sort()
+    return " ".join(cleaned)
+
+
+def _old_vectorize(item: NewsItem) -> Counter[str]:
+    text = " \n".join([item.title, item.summary or "", item.content or ""]).lower()
+    for delim in TOKEN_DELIMS:
+        text = text.replace(delim, " ")
+    return Counter(token for token in text.split() if len(token) > 2)
+
+
+RECOMPUTE: dict[str, Callable[[NewsItem], object]] = {
+    "dedupe title key": lambda item: _old_normalize_title(item.title),
+    "filter include": lambda item: any(k in item.text_blob().lower() for k in INCLUDE),
+    "filter exclude": lambda item: any(k in item.text_blob().lower() for k in EXCLUDE),
+    "index remember": lambda item: _old_normalize_title(item.title),
+    "cluster tokens": _old_vectorize,
+}
+MEMOIZED: dict[str, Callable[[NewsItem], object]] = {
+    "dedupe title key": lambda item: item.features().title_key,
+    "filter include": lambda item: any(k in item.features().blob for k in INCLUDE),
+    "filter exclude": lambda item: any(k in item.features().blob for k in EXCLUDE),
+    "index remember": lambda item: item.features().title_key,
+    "cluster tokens": lambda item: item.features().token_counts,
+}
+
+
+def _time_stages(items: list[NewsItem], stages: dict[str, Callable[[NewsItem], object]]) -> dict[str, float]:
+    timings = {}
+    for name, stage in stages.items():
+        start = time.perf_counter()
+        for item in items:
+            stage(item)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    args = parser.parse_args()
+
+    before = _time_stages(synthetic_items(args.items), RECOMPUTE)
+    after = _time_stages(synthetic_items(args.items), MEMOIZED)
+    print(f"{args.items} items")
+    print(f"{'stage':<18} {'recompute ms':>13} {'memoized ms':>12} {'saved':>7}")
+    for name in RECOMPUTE:
+        saved = 1 - after[name] / before[name] if before[name] else 0.0
+        print(f"{name:<18} {before[name] * 1000:>13.1f} {after[name] * 1000:>12.1f} {saved:>6.0%}")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(f"{'total':<18} {total_before * 1000:>13.1f} {total_after * 1000:>12.1f} {1 - total_after / total_before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,141 @@
 from __future__ import annotations
 
 import json
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
+from .links import canonical_link
 from .models import Cluster, NewsItem
 
+# 2: seen_links keyed on canonical links instead of raw feed URLs.
+STATE_VERSION = 2
+
 
 class CacheStore:
     def __init__(self, cache_dir: Path):
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.path = self.cache_dir / "state.json"
+        self._lock = threading.Lock()
+        self._dirty = False
         self._data = self._load()
+        # Parsed items per feed with the body hash they came from, persisted
+        # in parsed_items.json so unchanged feeds (304 or identical body) are
+        # served without re-parsing, also by a later process.
+        self.parsed_path = self.cache_dir / "parsed_items.json"
+        self._parsed: dict[str, dict[str, Any]] | None = None
+        self._parsed_dirty = False
 
-    def _load(self) -> dict[str, dict[str, str]]:
-        if not self.path.exists():
-            return {"seen_links": {}, "seen_clusters": {}}
-        try:
-            return json.loads(self.path.read_text())
-        except json.JSONDecodeError:
-            return {"seen_links": {}, "seen_clusters": {}}
+    def _load(self) -> dict[str, dict[str, Any]]:
+        data: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+            except json.JSONDecodeError:
+                data = {}
+        for section in ("seen_links", "seen_clusters", "feeds"):
+            data.setdefault(section, {})
+        if data.get("version", 1) < STATE_VERSION:
+            data["seen_links"] = _canonical_seen_links(data["seen_links"])
+            data["version"] = STATE_VERSION
+            self._dirty = True
+        return data
 
     def _save(self) -> None:
-        self.path.write_text(json.dumps(self._data, indent=2))
+        with self._lock:
+            self.path.write_text(json.dumps(self._data, indent=2))
+            self._dirty = False
+
+    def flush(self) -> None:
+        """Persist pending feed-state updates and parsed items."""
+        if self._dirty:
+            self._save()
+        with self._lock:
+            if self._parsed_dirty and self._parsed is not None:
+                self.parsed_path.write_text(json.dumps(self._parsed))
+                self._parsed_dirty = False
+
+    def feed_state(self, url: str) -> dict[str, Any]:
+        """Per-feed HTTP metadata (validators etc.) recorded by ``fetch_feed``."""
+        with self._lock:
+            return dict(self._data["feeds"].get(url, {}))
+
+    def update_feed_state(self, url: str, **fields: Any) -> None:
+        """Merge fields into a feed's state; ``None`` values drop the key."""
+        with self._lock:
+            state = self._data["feeds"].setdefault(url, {})
+            for key, value in fields.items():
+                if value is None:
+                    state.pop(key, None)
+                else:
+                    state[key] = value
+            self._dirty = True
+
+    def has_parsed_items(self, url: str, content_hash: str | None) -> bool:
+        with self._lock:
+            entry = self._parsed_store().get(url)
+            return bool(content_hash and entry and entry.get("content_hash") == content_hash)
+
+    def parsed_items(self, url: str, content_hash: str | None) -> list[NewsItem] | None:
+        """Items parsed from the body with ``content_hash``; ``None`` if not stored."""
+        if not self.has_parsed_items(url, content_hash):
+            return None
+        with self._lock:
+            return [NewsItem.from_dict(raw) for raw in self._parsed_store()[url]["items"]]
+
+    def remember_parsed_items(self, url: str, content_hash: str, items: Sequence[NewsItem]) -> None:
+        with self._lock:
+            self._parsed_store()[url] = {
+                "content_hash": content_hash,
+                "items": [item.to_dict() for item in items],
+            }
+            self._parsed_dirty = True
+
+    def _parsed_store(self) -> dict[str, dict[str, Any]]:
+        # Loaded on first use: commands that never fetch do not read it.
+        if self._parsed is None:
+            try:
+                self._parsed = json.loads(self.parsed_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                self._parsed = {}
+        return self._parsed
 
     def has_seen(self, link: str) -> bool:
-        return link in self._data["seen_links"]
+        return (canonical_link(link) or link) in self._data["seen_links"]
 
     def mark_seen(self, link: str) -> None:
-        self._data["seen_links"][link] = self._now()
+        self._data["seen_links"][canonical_link(link) or link] = self._now()
 
     def filter_new_items(self, items: Sequence[NewsItem], *, mark: bool = False) -> list[NewsItem]:
+        seen_links = self._data["seen_links"]
         fresh: list[NewsItem] = []
         for item in items:
-            if self.has_seen(item.link):
+            key = _seen_key(item)
+            if key in seen_links:
                 continue
             fresh.append(item)
             if mark:
-                self.mark_seen(item.link)
+                seen_links[key] = self._now()
         if mark:
             self._save()
         return fresh
 
+    def iter_new_items(self, items: Iterable[NewsItem]) -> Iterator[NewsItem]:
+        """Streaming seen-check; marking stays with ``mark_items``."""
+        seen_links = self._data["seen_links"]
+        for item in items:
+            if _seen_key(item) not in seen_links:
+                yield item
+
     def mark_items(self, items: Iterable[NewsItem]) -> None:
         changed = False
+        seen_links = self._data["seen_links"]
         for item in items:
-            if item.link not in self._data["seen_links"]:
-                self._data["seen_links"][item.link] = self._now()
+            key = _seen_key(item)
+            if key not in seen_links:
+                seen_links[key] = self._now()
                 changed = True
         if changed:
             self._save()
@@ -69,3 +156,17 @@ class CacheStore:
     @staticmethod
     def _now() -> str:
         return datetime.now(tz=timezone.utc).isoformat()
+
+
+def _seen_key(item: NewsItem) -> str:
+    return item.link_key() or item.link
+
+
+def _canonical_seen_links(seen_links: dict[str, str]) -> dict[str, str]:
+    """Re-key version-1 entries, keeping the earliest timestamp per canonical link."""
+    migrated: dict[str, str] = {}
+    for link, seen_at in seen_links.items():
+        key = canonical_link(link) or link
+        if key not in migrated or seen_at < migrated[key]:
+            migrated[key] = seen_at
+    return migrated
@@ -5,6 +5,8 @@ import shutil
 import subprocess
 import sys
 import time
+from datetime import timedelta
+from enum import Enum
 from pathlib import Path
 from typing import Iterable
 
@@ -12,24 +14,30 @@ import typer
 from rich.console import Console
 
 from .cache import CacheStore
+from .cluster import CLUSTER_ENGINES, ClusterStore
 from .config import AppConfig, build_since_from_cli, load_config, parse_duration
-from .dedupe import dedupe_items
+from .dedupe import DedupeIndex, dedupe_items
 from .feeds import fetch_all_feeds
 from .filter import apply_filters
-from .models import FilterOptions, PipelineOptions
+from .models import FilterOptions, PipelineOptions, utc_now
 from .ollama_client import OllamaClient, OllamaConfig, build_client
-from .render import print_clusters, print_fetch_summary, set_color
+from .render import LiveClusterPrinter, print_clusters, print_feed_stats, print_fetch_summary, set_color
+from .schedule import FeedScheduler
 from .summarize import PipelineResult, run_pipeline
+from .summary_cache import SummaryCache
+from .telemetry import FetchStatsStore
+from .transport import HttpTransport, build_transport
 
 app = typer.Typer(help="RSS Intelligence CLI")
+# Typer validates Enum options and lists the choices in --help.
+ClusterEngine = Enum("ClusterEngine", {engine: engine for engine in CLUSTER_ENGINES}, type=str)
 
 
 def _setup(config_path: Path) -> tuple[AppConfig, CacheStore, Path]:
+    """Load the config and open the cache; the returned cache dir is shared by every on-disk store."""
     result = load_config(config_path)
-    base_dir = result.path.parent
-    cache_dir = result.config.ensure_cache_dir(base_dir)
-    cache = CacheStore(cache_dir)
-    return result.config, cache, base_dir
+    cache_dir = result.config.ensure_cache_dir(result.path.parent)
+    return result.config, CacheStore(cache_dir), cache_dir
 
 
 @app.command()
@@ -43,14 +51,24 @@ def fetch(
     tag: list[str] | None = typer.Option(None, "--tag", help="Only include feed tag"),
     color: bool = typer.Option(False, "--color/--no-color", help="Enable ANSI colors in output"),
 ) -> None:
-    config, cache, _ = _setup(config_path)
+    config, cache, cache_dir = _setup(config_path)
     set_color(color)
-    items = fetch_all_feeds(config.feeds, config.settings)
-    deduped = dedupe_items(items)
-    unseen = cache.filter_new_items(deduped, mark=False)
+    telemetry = FetchStatsStore(cache_dir)
+    with build_transport(config.settings, config.feeds) as transport:
+        items = fetch_all_feeds(
+            config.feeds, config.settings, cache=cache, session=transport.session, telemetry=telemetry
+        )
+    dedupe_index = _build_dedupe_index(config, cache_dir)
+    unseen = cache.filter_new_items(items, mark=False)
+    deduped = dedupe_items(
+        unseen,
+        engine=config.settings.dedupe_engine,
+        index=dedupe_index,
+        body_distance=config.settings.dedupe_body_distance,
+    )
     since_dt = build_since_from_cli(since, config.settings)
     filtered = apply_filters(
-        unseen,
+        deduped,
         FilterOptions(
             since=since_dt,
             include=tuple(include or []),
@@ -60,6 +78,8 @@ def fetch(
         ),
     )
     cache.mark_items(filtered)
+    if dedupe_index is not None:
+        dedupe_index.remember(filtered)
     top_n = top or config.settings.top_n_fetch
     print_fetch_summary(filtered, top_n=top_n)
 
@@ -74,7 +94,13 @@ def summarize(
     tag: list[str] | None = typer.Option(None, "--tag", help="Only include feed tag"),
     threshold: float = typer.Option(0.55, help="Clustering similarity threshold (0-1)"),
     max_items: int | None = typer.Option(None, help="Cap number of items processed"),
-    llm: bool = typer.Option(True, "--llm/--no-llm", help="Toggle Ollama summarization"),
+    llm: bool = typer.Option(
+        True, "--llm/--no-llm", help="Toggle Ollama summarization (embedding clustering still uses Ollama)"
+    ),
+    stream: bool = typer.Option(False, "--stream/--no-stream", help="Stream items through dedupe/filters as feeds arrive"),
+    cluster_engine: ClusterEngine | None = typer.Option(
+        None, "--cluster-engine", help="Clustering backend (default from settings)"
+    ),
     color: bool = typer.Option(False, "--color/--no-color", help="Enable ANSI colors in output"),
 ) -> None:
     _run_summarize_command(
@@ -88,6 +114,8 @@ def summarize(
         max_items,
         llm,
         color,
+        stream=stream,
+        cluster_engine=cluster_engine,
         debug=False,
     )
 
@@ -102,7 +130,13 @@ def summarize_debug(
     tag: list[str] | None = typer.Option(None, "--tag", help="Only include feed tag"),
     threshold: float = typer.Option(0.55, help="Clustering similarity threshold (0-1)"),
     max_items: int | None = typer.Option(None, help="Cap number of items processed"),
-    llm: bool = typer.Option(True, "--llm/--no-llm", help="Toggle Ollama summarization"),
+    llm: bool = typer.Option(
+        True, "--llm/--no-llm", help="Toggle Ollama summarization (embedding clustering still uses Ollama)"
+    ),
+    stream: bool = typer.Option(False, "--stream/--no-stream", help="Stream items through dedupe/filters as feeds arrive"),
+    cluster_engine: ClusterEngine | None = typer.Option(
+        None, "--cluster-engine", help="Clustering backend (default from settings)"
+    ),
     color: bool = typer.Option(True, "--color/--no-color", help="Enable ANSI colors in output"),
 ) -> None:
     _run_summarize_command(
@@ -116,6 +150,8 @@ def summarize_debug(
         max_items,
         llm,
         color,
+        stream=stream,
+        cluster_engine=cluster_engine,
         debug=True,
     )
 
@@ -131,27 +167,87 @@ def watch(
     tag: list[str] | None = typer.Option(None, "--tag", help="Only include feed tag"),
     threshold: float = typer.Option(0.55, help="Clustering similarity threshold (0-1)"),
     max_items: int | None = typer.Option(None, help="Cap number of items processed"),
-    llm: bool = typer.Option(True, "--llm/--no-llm", help="Toggle Ollama summarization"),
+    llm: bool = typer.Option(
+        True, "--llm/--no-llm", help="Toggle Ollama summarization (embedding clustering still uses Ollama)"
+    ),
+    stream: bool = typer.Option(False, "--stream/--no-stream", help="Stream items through dedupe/filters as feeds arrive"),
+    cluster_engine: ClusterEngine | None = typer.Option(
+        None, "--cluster-engine", help="Clustering backend (default from settings)"
+    ),
     notify: bool = typer.Option(False, "--notify", help="Use notify-send when available"),
     color: bool = typer.Option(False, "--color/--no-color", help="Enable ANSI colors in output"),
+    adaptive: bool = typer.Option(
+        True,
+        "--adaptive/--fixed",
+        help="Poll each feed on its own adaptive schedule (--interval is the starting point)",
+    ),
 ) -> None:
-    config, cache, _ = _setup(config_path)
+    config, cache, cache_dir = _setup(config_path)
     set_color(color)
     interval_seconds = max(5, int(parse_duration(interval).total_seconds()))
-    client = _maybe_build_ollama(config, llm)
+    scheduler = _build_scheduler(config, cache, interval_seconds) if adaptive else None
+    transport = build_transport(config.settings, config.feeds)
+    telemetry = FetchStatsStore(cache_dir)
+    dedupe_index = _build_dedupe_index(config, cache_dir)
+    cluster_store = _build_cluster_store(config, cache_dir)
+    summary_cache = _build_summary_cache(config, cache_dir)
+    engine = cluster_engine.value if cluster_engine else None
+    client = _maybe_build_ollama(config, llm, transport, cache_dir, engine)
+    printer = _build_live_printer(config, client if llm else None)
     try:
         while True:
-            start = time.perf_counter()
-            filter_opts = _build_filter_options(config, since, include, exclude, domain, tag, max_items)
-            pipeline_opts = PipelineOptions(filters=filter_opts, threshold=threshold, max_items=max_items, llm_enabled=llm)
-            result = run_pipeline(config, cache, pipeline_opts, llm=client)
-            _render_result(result)
-            _print_run_stats(time.perf_counter() - start, prefix="[watch]")
-            if notify and result.clusters:
-                _notify(f"{len(result.clusters)} new clusters")
-            time.sleep(interval_seconds)
+            due = scheduler.due_feeds(config.feeds) if scheduler else config.feeds
+            if due:
+                start = time.perf_counter()
+                started_at = utc_now()
+                _start_warm_up(config, client if llm else None)
+                filter_opts = _build_filter_options(config, since, include, exclude, domain, tag, max_items)
+                pipeline_opts = PipelineOptions(
+                    filters=filter_opts,
+                    threshold=threshold,
+                    max_items=max_items,
+                    llm_enabled=llm,
+                    stream=stream,
+                    cluster_engine=engine,
+                )
+                result = run_pipeline(
+                    config,
+                    cache,
+                    pipeline_opts,
+                    llm=client,
+                    transport=transport,
+                    feeds=due,
+                    telemetry=telemetry,
+                    dedupe_index=dedupe_index,
+                    cluster_store=cluster_store,
+                    summary_cache=summary_cache,
+                    printer=printer,
+                )
+                if scheduler:
+                    # A stream cut short by --max-items never fetches some due feeds; they stay due.
+                    fetched = telemetry.urls_fetched_since(started_at)
+                    scheduler.record([feed for feed in due if feed.url in fetched])
+                _render_result(result, printer)
+                _print_run_stats(time.perf_counter() - start, prefix=f"[watch {len(due)} feeds]", transport=transport)
+                if notify and result.clusters:
+                    _notify(f"{len(result.clusters)} new or updated clusters")
+            sleep_s = scheduler.seconds_until_next(config.feeds) if scheduler else interval_seconds
+            time.sleep(max(5.0, sleep_s))
     except KeyboardInterrupt:
         typer.echo("Stopping watch mode...")
+    finally:
+        transport.close()
+
+
+@app.command("feed-stats")
+def feed_stats(
+    config_path: Path = typer.Option(Path("feeds.yaml"), "--config", help="Path to feeds YAML"),
+    top: int | None = typer.Option(None, help="Only show the N slowest feeds"),
+) -> None:
+    """Show p50/p95 fetch latency and size per feed from recorded runs."""
+    _, _, cache_dir = _setup(config_path)
+    summaries = FetchStatsStore(cache_dir).summarize()
+    print_feed_stats(summaries[:top] if top else summaries)
 
 
 def _run_summarize_command(
@@ -166,18 +262,85 @@ def _run_summarize_command(
     llm: bool,
     color: bool,
     *,
+    stream: bool = False,
+    cluster_engine: ClusterEngine | None = None,
     debug: bool,
 ) -> None:
-    config, cache, _ = _setup(config_path)
+    config, cache, cache_dir = _setup(config_path)
     set_color(color)
     reporter = _build_debug_reporter(debug, color)
     start = time.perf_counter()
+    engine = cluster_engine.value if cluster_engine else None
     filter_opts = _build_filter_options(config, since, include, exclude, domain, tag, max_items)
-    pipeline_opts = PipelineOptions(filters=filter_opts, threshold=threshold, max_items=max_items, llm_enabled=llm)
-    client = _maybe_build_ollama(config, llm)
-    result = run_pipeline(config, cache, pipeline_opts, llm=client, reporter=reporter)
-    _render_result(result)
-    _print_run_stats(time.perf_counter() - start)
+    pipeline_opts = PipelineOptions(
+        filters=filter_opts,
+        threshold=threshold,
+        max_items=max_items,
+        llm_enabled=llm,
+        stream=stream,
+        cluster_engine=engine,
+    )
+    with build_transport(config.settings, config.feeds) as transport:
+        client = _maybe_build_ollama(config, llm, transport, cache_dir, engine)
+        _start_warm_up(config, client if llm else None)
+        printer = _build_live_printer(config, client if llm else None)
+        result = run_pipeline(
+            config,
+            cache,
+            pipeline_opts,
+            llm=client,
+            reporter=reporter,
+            transport=transport,
+            telemetry=FetchStatsStore(cache_dir),
+            dedupe_index=_build_dedupe_index(config, cache_dir),
+            cluster_store=_build_cluster_store(config, cache_dir),
+            summary_cache=_build_summary_cache(config, cache_dir),
+            printer=printer,
+        )
+        _render_result(result, printer)
+        _print_run_stats(time.perf_counter() - start, transport=transport)
+
+
+def _build_scheduler(config: AppConfig, cache: CacheStore, interval_seconds: int) -> FeedScheduler:
+    settings = config.settings
+    return FeedScheduler(
+        cache,
+        base_interval=timedelta(seconds=interval_seconds),
+        min_interval=parse_duration(settings.poll_min_interval),
+        max_interval=parse_duration(settings.poll_max_interval),
+    )
+
+
+def _build_dedupe_index(config: AppConfig, cache_dir: Path) -> DedupeIndex | None:
+    size = config.settings.dedupe_index_size
+    if size <= 0:
+        return None
+    window = config.settings.dedupe_index_window
+    return DedupeIndex(
+        cache_dir,
+        max_entries=size,
+        body_distance=config.settings.dedupe_body_distance,
+        window=parse_duration(window) if window else None,
+    )
+
+
+def _build_cluster_store(config: AppConfig, cache_dir: Path) -> ClusterStore | None:
+    window = config.settings.cluster_window
+    if not window:
+        return None
+    return ClusterStore(cache_dir, window=parse_duration(window))
+
+
+def _build_summary_cache(config: AppConfig, cache_dir: Path) -> SummaryCache | None:
+    size = config.settings.summary_cache_size
+    if size <= 0:
+        return None
+    ttl = config.settings.summary_cache_ttl
+    return SummaryCache(
+        cache_dir,
+        max_entries=size,
+        ttl=parse_duration(ttl) if ttl else None,
+    )
 
 
 def _build_filter_options(
@@ -200,23 +363,57 @@ def _build_filter_options(
     )
 
 
-def _maybe_build_ollama(config: AppConfig, llm_flag: bool) -> OllamaClient | None:
+def _maybe_build_ollama(
+    config: AppConfig,
+    llm_flag: bool,
+    transport: HttpTransport | None = None,
+    cache_dir: Path | None = None,
+    cluster_engine: str | None = None,
+) -> OllamaClient | None:
+    # --no-llm only turns off summaries; embedding clustering still needs the client.
     settings = config.settings.ollama
-    if not (llm_flag and settings.enabled):
+    embedding = (cluster_engine or config.settings.cluster_engine) == "embedding"
+    if not ((llm_flag or embedding) and settings.enabled):
         return None
     ollama_config = OllamaConfig(
         base_url=settings.base_url,
         model=settings.model,
         timeout_s=settings.timeout_s,
+        embed_model=settings.embed_model,
+        stream=settings.stream,
+        token_deadline_s=settings.token_deadline_s,
+        keep_alive=settings.keep_alive,
+        prompt_token_budget=settings.prompt_token_budget,
+        num_ctx=settings.num_ctx,
+        num_predict=settings.num_predict,
+    )
+    return build_client(
+        ollama_config,
+        session=transport.session if transport else None,
+        status_path=cache_dir / "ollama_status.json" if cache_dir else None,
+        status_ttl=parse_duration(settings.availability_ttl) if settings.availability_ttl else None,
     )
-    return build_client(ollama_config)
 
 
-def _render_result(result: PipelineResult) -> None:
+def _start_warm_up(config: AppConfig, client: OllamaClient | None) -> None:
+    # Overlaps the model load with feed fetching; generation requests queue behind it.
+    if client is not None and config.settings.ollama.warm_up:
+        client.start_warm_up()
+
+
+def _build_live_printer(config: AppConfig, client: OllamaClient | None) -> LiveClusterPrinter | None:
+    # Only streamed generations benefit; otherwise render once at the end.
+    if client is None or not config.settings.ollama.stream:
+        return None
+    return LiveClusterPrinter()
+
+
+def _render_result(result: PipelineResult, printer: LiveClusterPrinter | None = None) -> None:
     if not result.items:
         typer.echo("No new items to process.")
         return
-    print_clusters(result.clusters)
+    if printer is None or not result.clusters:
+        print_clusters(result.clusters)
 
 
 def _notify(message: str) -> None:
@@ -227,10 +424,13 @@ def _notify(message: str) -> None:
         typer.echo(f"[notify] {message}")
 
 
-def _print_run_stats(duration_s: float, prefix: str = "") -> None:
+def _print_run_stats(duration_s: float, prefix: str = "", transport: HttpTransport | None = None) -> None:
     memory_mb = _current_memory_mb()
     label = f"{prefix} " if prefix else ""
-    typer.echo(f"{label}Completed in {duration_s:.2f}s | RSS ~{memory_mb:.1f} MB")
+    line = f"{label}Completed in {duration_s:.2f}s | RSS ~{memory_mb:.1f} MB"
+    if transport is not None:
+        line += f" | {transport.stats().describe()}"
+    typer.echo(line)
 
 
 def _current_memory_mb() -> float:
@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import repeat
 from math import sqrt
-from typing import Sequence
+from pathlib import Path
+from typing import Any, Iterable, Sequence
 
-from .models import Cluster, NewsItem, newest_first
+from .models import Cluster, NewsItem, newest_first, utc_now
+from .prompt import SUMMARY_CHARS
+from .text import token_counts
 
-_TOKEN_DELIMS = "\t\n\r .,;:!?()[]{}<>\"'"
+CLUSTER_ENGINES = ("inverted", "linear", "tfidf", "embedding")
+# Items kept per persisted cluster (the first one plus the newest); the
+# centroid still counts every item that ever joined.
+MAX_STORED_ITEMS = 20
+# Below this many items per shard, process start-up costs more than it saves.
+MIN_SHARD_ITEMS = 500
+
+
+class ClusterError(RuntimeError):
+    pass
 
 
 def cluster_items(
@@ -14,53 +33,340 @@ def cluster_items(
     *,
     similarity_threshold: float = 0.55,
     max_items: int | None = None,
+    engine: str = "inverted",
+    workers: int = 1,
 ) -> list[Cluster]:
+    """Greedy single-pass clustering: each item joins the first cluster it is similar enough to.
+
+    ``engine="inverted"`` only scores clusters sharing a token with the item
+    (token -> cluster postings, running centroid norms); ``engine="linear"``
+    computes the cosine against every cluster. Both give the same clusters.
+    ``engine="tfidf"`` (numpy/scipy) compares hashed TF-IDF vectors against
+    each cluster's first item in batched sparse products, for large backfills.
+
+    ``workers > 1`` (0 = all cores) shards large inputs into time buckets that
+    are clustered in a process pool and then merged; see ``_assign_sharded``.
+    """
+    if engine not in _ASSIGNERS:
+        raise ClusterError(f"Unknown cluster engine {engine!r}; expected one of {', '.join(_ASSIGNERS)}")
     ordered = newest_first(items)
     if max_items is not None:
         ordered = ordered[:max_items]
 
-    clusters: list[Cluster] = []
-    vectors: list[Counter[str]] = []
+    shards = shard_count(len(ordered), workers) if engine != "tfidf" else 1
+    if shards > 1:
+        groups, vectors = _assign_sharded(ordered, similarity_threshold, shards)
+    else:
+        groups, vectors = _ASSIGNERS[engine]([(item, _vectorize_item(item)) for item in ordered], similarity_threshold)
+
+    return clusters_from_groups(groups, vectors)
 
-    for item in ordered:
-        item_vector = _vectorize_item(item)
-        assigned = False
+
+def shard_count(item_count: int, workers: int) -> int:
+    """Time-bucket shards ``cluster_items`` uses for ``item_count`` items; 1 means serial."""
+    workers = workers or os.cpu_count() or 1
+    return max(1, min(workers, item_count // MIN_SHARD_ITEMS))
+
+
+def clusters_from_groups(groups: Sequence[list[NewsItem]], vectors: Sequence[Counter[str]]) -> list[Cluster]:
+    """Numbered clusters with keywords from each group's summed token counts."""
+    return [
+        Cluster(
+            cluster_id=f"cluster-{idx}",
+            items=group,
+            keywords=_top_keywords(vector, k=5),
+            score=float(len(group)),
+        )
+        for idx, (group, vector) in enumerate(zip(groups, vectors), start=1)
+    ]
+
+
+def _assign_linear(
+    vectorized: Sequence[tuple[NewsItem, Counter[str]]], threshold: float
+) -> tuple[list[list[NewsItem]], list[Counter[str]]]:
+    groups: list[list[NewsItem]] = []
+    vectors: list[Counter[str]] = []
+    for item, item_vector in vectorized:
         for idx, vector in enumerate(vectors):
-            score = _cosine_similarity(item_vector, vector)
-            if score >= similarity_threshold:
-                clusters[idx].items.append(item)
-                clusters[idx].score = max(clusters[idx].score, score)
+            if _cosine_similarity(item_vector, vector) >= threshold:
+                groups[idx].append(item)
                 vector.update(item_vector)
-                assigned = True
                 break
-        if not assigned:
-            cluster_id = f"cluster-{len(clusters) + 1}"
-            clusters.append(
-                Cluster(
-                    cluster_id=cluster_id,
-                    items=[item],
-                    score=1.0,
+        else:
+            groups.append([item])
+            vectors.append(Counter(item_vector))
+    return groups, vectors
+
+
+def _assign_inverted(
+    vectorized: Sequence[tuple[NewsItem, Counter[str]]], threshold: float
+) -> tuple[list[list[NewsItem]], list[Counter[str]]]:
+    groups: list[list[NewsItem]] = []
+    centroids = CentroidIndex()
+    for item, item_vector in vectorized:
+        chosen = centroids.match(item_vector, threshold)
+        if chosen is None:
+            groups.append([item])
+            centroids.add(item_vector)
+        else:
+            groups[chosen].append(item)
+            centroids.update(chosen, item_vector)
+    return groups, centroids.vectors
+
+
+def _assign_sharded(
+    ordered: Sequence[NewsItem], threshold: float, shards: int
+) -> tuple[list[list[NewsItem]], list[Counter[str]]]:
+    """Cluster contiguous time buckets in parallel, then merge similar shard clusters.
+
+    The merge pass walks shard clusters newest bucket first and joins each to
+    the first merged centroid within ``threshold``, the same rule items follow
+    inside a shard. A story straddling a bucket edge therefore still ends up
+    in one cluster, but results can differ slightly from a serial run.
+    """
+    bounds = [round(idx * len(ordered) / shards) for idx in range(shards + 1)]
+    buckets = [ordered[low:high] for low, high in zip(bounds, bounds[1:])]
+    texts = [[(item.title, item.summary, item.content) for item in bucket] for bucket in buckets]
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        results = list(pool.map(_cluster_shard, texts, repeat(threshold)))
+
+    groups: list[list[NewsItem]] = []
+    merged = CentroidIndex()
+    for bucket, (labels, vectors) in zip(buckets, results):
+        members: list[list[NewsItem]] = [[] for _ in vectors]
+        for item, label in zip(bucket, labels):
+            members[label].append(item)
+        for group, vector in zip(members, vectors):
+            idx = merged.match(vector, threshold)
+            if idx is None:
+                merged.add(vector)
+                groups.append(group)
+            else:
+                merged.update(idx, vector)
+                groups[idx].extend(group)
+    return groups, merged.vectors
+
+
+def _cluster_shard(
+    texts: Sequence[tuple[str, str | None, str | None]], threshold: float
+) -> tuple[list[int], list[Counter[str]]]:
+    centroids = CentroidIndex()
+    labels: list[int] = []
+    for title, summary, content in texts:
+        vector = token_counts(title, summary, content)
+        idx = centroids.match(vector, threshold)
+        if idx is None:
+            idx = centroids.add(vector)
+        else:
+            centroids.update(idx, vector)
+        labels.append(idx)
+    return labels, centroids.vectors
+
+
+class CentroidIndex:
+    """Summed token vectors with a token -> centroid postings index and running squared norms.
+
+    ``match`` only scores centroids sharing a token with the query and returns
+    the first (oldest) one at or above the threshold, like the linear scan.
+    """
+
+    def __init__(self, vectors: Iterable[Counter[str]] = ()):
+        self.vectors: list[Counter[str]] = []
+        self._sq_norms: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for vector in vectors:
+            self.add(vector)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def match(self, vector: Counter[str], threshold: float) -> int | None:
+        if threshold <= 0:
+            # Centroids sharing no token score 0.0, which still passes.
+            return 0 if self.vectors else None
+        dots: dict[int, int] = {}
+        for token, count in vector.items():
+            for idx in self._postings.get(token, ()):
+                dots[idx] = dots.get(idx, 0) + count * self.vectors[idx][token]
+        norm = sqrt(sum(value * value for value in vector.values()))
+        for idx in sorted(dots):
+            # Integer dot products and squared norms keep scores bit-identical to _cosine_similarity.
+            if dots[idx] / (norm * sqrt(self._sq_norms[idx])) >= threshold:
+                return idx
+        return None
+
+    def add(self, vector: Counter[str]) -> int:
+        self.vectors.append(Counter())
+        self._sq_norms.append(0)
+        idx = len(self.vectors) - 1
+        self.update(idx, vector)
+        return idx
+
+    def update(self, idx: int, vector: Counter[str]) -> None:
+        centroid = self.vectors[idx]
+        for token, count in vector.items():
+            old = centroid[token]
+            if not old:
+                self._postings.setdefault(token, []).append(idx)
+            centroid[token] = old + count
+            self._sq_norms[idx] += (old + count) ** 2 - old * old
+
+
+def _assign_tfidf(
+    vectorized: Sequence[tuple[NewsItem, Counter[str]]], threshold: float
+) -> tuple[list[list[NewsItem]], list[Counter[str]]]:
+    try:
+        from . import tfidf
+    except ImportError as exc:
+        raise ClusterError("The tfidf cluster engine needs numpy and scipy: pip install 'rss-intelligence[tfidf]'") from exc
+
+    labels = tfidf.leader_labels(tfidf.tfidf_matrix([vector for _, vector in vectorized]), threshold)
+    groups: list[list[NewsItem]] = []
+    vectors: list[Counter[str]] = []
+    for (item, item_vector), label in zip(vectorized, labels):
+        if label == len(groups):
+            groups.append([])
+            vectors.append(Counter())
+        groups[label].append(item)
+        vectors[label].update(item_vector)
+    return groups, vectors
+
+
+# Token engines; "embedding" needs an Ollama client and lives in news.embeddings.
+_ASSIGNERS = {"inverted": _assign_inverted, "linear": _assign_linear, "tfidf": _assign_tfidf}
+
+
+@dataclass(slots=True)
+class _LiveCluster:
+    cluster_id: str
+    items: list[NewsItem]
+    size: int
+    updated_at: datetime
+    summary: str | None = None
+
+
+class ClusterStore:
+    """Live clusters persisted across runs in ``<cache_dir>/clusters.json``.
+
+    New items join the first live cluster they are similar enough to, so a
+    follow-up story attaches to yesterday's cluster instead of opening a new
+    one. Ids derive from a cluster's first item and stay stable across runs;
+    clusters that got no new item within ``window`` are dropped.
+    """
+
+    def __init__(self, cache_dir: Path, *, window: timedelta):
+        self.path = cache_dir / "clusters.json"
+        self.window = window
+        self._clusters: list[_LiveCluster] = []
+        vectors: list[Counter[str]] = []
+        for raw in self._load():
+            self._clusters.append(
+                _LiveCluster(
+                    cluster_id=raw["id"],
+                    items=[NewsItem.from_dict(item) for item in raw.get("items", [])],
+                    size=raw.get("size", 0),
+                    updated_at=datetime.fromisoformat(raw["updated_at"]),
+                    summary=raw.get("summary"),
                 )
             )
-            vectors.append(item_vector)
+            vectors.append(Counter(raw.get("vector", {})))
+        self._centroids = CentroidIndex(vectors)
 
-    for cluster, vector in zip(clusters, vectors):
-        cluster.keywords = _top_keywords(vector, k=5)
-        cluster.score = float(len(cluster.items))
-    return clusters
+    def _load(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            return json.loads(self.path.read_text()).get("clusters", [])
+        except (json.JSONDecodeError, AttributeError):
+            return []
 
+    def _save(self) -> None:
+        clusters = [
+            {
+                "id": live.cluster_id,
+                "size": live.size,
+                "updated_at": live.updated_at.isoformat(),
+                "summary": live.summary,
+                "vector": dict(vector),
+                "items": [item.to_dict(text_chars=SUMMARY_CHARS) for item in live.items],
+            }
+            for live, vector in zip(self._clusters, self._centroids.vectors)
+        ]
+        self.path.write_text(json.dumps({"clusters": clusters}))
 
-def _vectorize_item(item: NewsItem) -> Counter[str]:
-    text_parts = [item.title, item.summary or "", item.content or ""]
-    tokens = _tokenize(" \n".join(text_parts))
-    return Counter(tokens)
+    def __len__(self) -> int:
+        return len(self._clusters)
 
+    def attach(
+        self,
+        items: Sequence[NewsItem],
+        *,
+        similarity_threshold: float = 0.55,
+        now: datetime | None = None,
+    ) -> list[Cluster]:
+        """Add new items and return only the clusters they created or changed, items newest first."""
+        now = now or utc_now()
+        self._expire(now)
+        changed: set[int] = set()
+        for item in newest_first(items):
+            vector = _vectorize_item(item)
+            idx = self._centroids.match(vector, similarity_threshold)
+            if idx is None:
+                idx = self._centroids.add(vector)
+                self._clusters.append(_LiveCluster(cluster_id=self._new_id(item), items=[], size=0, updated_at=now))
+            else:
+                self._centroids.update(idx, vector)
+            live = self._clusters[idx]
+            live.items.append(item)
+            if len(live.items) > MAX_STORED_ITEMS:
+                # Batches arrive newest first, so drop by date rather than position.
+                del live.items[min(range(1, len(live.items)), key=lambda pos: live.items[pos].published_dt or now)]
+            live.size += 1
+            live.updated_at = now
+            changed.add(idx)
+        return [
+            Cluster(
+                cluster_id=self._clusters[idx].cluster_id,
+                items=newest_first(self._clusters[idx].items),
+                keywords=_top_keywords(self._centroids.vectors[idx], k=5),
+                score=float(self._clusters[idx].size),
+                summary=self._clusters[idx].summary,
+            )
+            for idx in sorted(changed)
+        ]
 
-def _tokenize(text: str) -> list[str]:
-    text = text.lower()
-    for delim in _TOKEN_DELIMS:
-        text = text.replace(delim, " ")
-    return [token for token in text.split() if len(token) > 2]
+    def record_summaries(self, clusters: Iterable[Cluster]) -> None:
+        """Keep the latest summaries and persist the store."""
+        summaries = {cluster.cluster_id: cluster.summary for cluster in clusters}
+        for live in self._clusters:
+            if live.cluster_id in summaries:
+                live.summary = summaries[live.cluster_id]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._save()
+
+    def _expire(self, now: datetime) -> None:
+        cutoff = now - self.window
+        keep = [idx for idx, live in enumerate(self._clusters) if live.updated_at >= cutoff]
+        if len(keep) == len(self._clusters):
+            return
+        vectors = self._centroids.vectors
+        self._clusters = [self._clusters[idx] for idx in keep]
+        self._centroids = CentroidIndex(vectors[idx] for idx in keep)
+
+    def _new_id(self, item: NewsItem) -> str:
+        digest = hashlib.sha1((item.link_key() or item.link or item.id).encode()).hexdigest()
+        taken = {live.cluster_id for live in self._clusters}
+        cluster_id = f"cluster-{digest[:12]}"
+        suffix = 2
+        while cluster_id in taken:
+            cluster_id = f"cluster-{digest[:12]}-{suffix}"
+            suffix += 1
+        return cluster_id
+
+
+def _vectorize_item(item: NewsItem) -> Counter[str]:
+    # Shared with the item's memo: read-only here.
+    return item.features().token_counts
 
 
 def _cosine_similarity(vec_a: Counter[str], vec_b: Counter[str]) -> float:
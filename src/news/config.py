@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field, ValidationError
@@ -14,6 +15,32 @@ class OllamaSettings(BaseModel):
     base_url: str = "http://127.0.0.1:11434"
     model: str = "phi3"
     timeout_s: int = 30
+    embed_model: str = "nomic-embed-text"
+    embed_batch_size: int = Field(default=32, ge=1)
+    # Stream tokens and render summaries as they are generated.
+    stream: bool = False
+    token_deadline_s: float | None = Field(default=None, gt=0)
+    # Pre-load the model while feeds are fetched, and keep it loaded this long:
+    # an Ollama duration such as "30m", or seconds as a number (-1 = forever).
+    # Set it above the watch interval.
+    warm_up: bool = True
+    keep_alive: int | str | None = None
+    # Remember a successful availability check for this long; None checks every run.
+    availability_ttl: str | None = "10m"
+    # Estimated prompt tokens per cluster; the context window must also fit num_predict.
+    prompt_token_budget: int = Field(default=768, ge=128)
+    num_ctx: int | None = Field(default=2048, ge=256)
+    num_predict: int | None = Field(default=320, ge=1)
+    # Concurrent generations; None follows OLLAMA_NUM_PARALLEL (else 1).
+    num_parallel: int | None = Field(default=None, ge=1)
+
+    def parallelism(self) -> int:
+        if self.num_parallel is not None:
+            return self.num_parallel
+        try:
+            return max(int(os.environ.get("OLLAMA_NUM_PARALLEL", "1")), 1)
+        except ValueError:
+            return 1
 
 
 class Settings(BaseModel):
@@ -23,6 +50,31 @@ class Settings(BaseModel):
     cache_dir: str = ".news_cache"
     default_since: str = "48h"
     top_n_fetch: int = 5
+    fetch_concurrency: int = Field(default=4, ge=1)
+    fast_parser: bool = False
+    dedupe_engine: Literal["lsh", "exact"] = "lsh"
+    dedupe_index_size: int = Field(default=5000, ge=0)
+    dedupe_index_window: str | None = "7d"
+    dedupe_body_distance: int | None = Field(default=3, ge=0, le=15)
+    cluster_engine: Literal["inverted", "linear", "tfidf", "embedding"] = "inverted"
+    cluster_window: str | None = "48h"
+    cluster_workers: int = Field(default=1, ge=0)
+    # Cosine cut-off for cluster_engine "embedding"; embedding similarities run
+    # much higher than bag-of-words ones, so --threshold does not apply there.
+    embedding_threshold: float = Field(default=0.8, ge=0, le=1)
+    summary_cache_size: int = Field(default=2000, ge=0)
+    summary_cache_ttl: str | None = "7d"
+    max_feed_bytes: int = Field(default=5 * 1024 * 1024, gt=0)
+    early_abort_oversize: bool = True
+    retry_backoff_s: float = Field(default=1.0, ge=0)
+    retry_backoff_max_s: float = Field(default=30.0, ge=0)
+    # Total backoff one feed may sleep in a fetch worker; past it the feed fails
+    # for this run (and counts towards the breaker) instead of holding the slot.
+    retry_backoff_budget_s: float = Field(default=10.0, ge=0)
+    breaker_threshold: int = Field(default=3, ge=1)
+    breaker_cooldown: str = "30m"
+    poll_min_interval: str = "5m"
+    poll_max_interval: str = "6h"
     ollama: OllamaSettings = Field(default_factory=OllamaSettings)
 
     def cache_path(self, base_path: Path | None = None) -> Path:
@@ -36,6 +88,7 @@ class FeedConfig(BaseModel):
     name: str
     url: str
     tags: list[str] = Field(default_factory=list)
+    max_bytes: int | None = Field(default=None, gt=0)
 
 
 class AppConfig(BaseModel):
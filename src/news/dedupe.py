@@ -1,98 +1,227 @@
 from __future__ import annotations
 
-import re
+import json
+from collections import Counter, deque
+from datetime import datetime, timedelta
 from difflib import SequenceMatcher
-from typing import Iterable, Sequence
-from urllib.parse import parse_qsl, urlparse, urlencode
-
-from .models import NewsItem
-
-STOPWORDS = {
-    "the",
-    "a",
-    "an",
-    "to",
-    "and",
-    "of",
-    "in",
-    "for",
-    "on",
-}
-TRACKING_PARAMS = {
-    "utm_source",
-    "utm_medium",
-    "utm_campaign",
-    "utm_term",
-    "utm_content",
-    "utm_id",
-    "utm_name",
-    "utm_reader",
-    "utm_place",
-    "fbclid",
-    "gclid",
-    "mc_cid",
-    "mc_eid",
-    "icmpid",
-    "ref",
-}
-
-
-def dedupe_items(items: Sequence[NewsItem], *, title_threshold: float = 0.92) -> list[NewsItem]:
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from .lsh import LSHIndex, MinHasher
+from .models import NewsItem, utc_now
+from .simhash import SimHashIndex
+
+_TITLE_HASHER = MinHasher()
+
+
+def dedupe_items(
+    items: Sequence[NewsItem],
+    *,
+    title_threshold: float = 0.92,
+    engine: str = "lsh",
+    index: DedupeIndex | None = None,
+    body_distance: int | None = 3,
+) -> list[NewsItem]:
+    return list(
+        iter_unique(
+            items,
+            title_threshold=title_threshold,
+            engine=engine,
+            index=index,
+            body_distance=body_distance,
+        )
+    )
+
+
+def iter_unique(
+    items: Iterable[NewsItem],
+    *,
+    title_threshold: float = 0.92,
+    engine: str = "lsh",
+    index: DedupeIndex | None = None,
+    body_distance: int | None = 3,
+) -> Iterator[NewsItem]:
+    """Incremental ``dedupe_items``: yields each item that survives dedupe.
+
+    ``engine="lsh"`` only runs the fuzzy title comparison against titles that
+    share a MinHash band; ``engine="exact"`` compares with every kept title.
+    Items whose body SimHash is within ``body_distance`` bits of a kept item
+    (syndicated copies under a rewritten headline) are dropped too; ``None``
+    disables the body check. A persistent ``index`` additionally drops items
+    matching earlier runs.
+    """
     seen_links: set[str] = set()
-    normalized_titles: list[str] = []
-    unique: list[NewsItem] = []
+    titles = _ExactTitleMatcher() if engine == "exact" else _LSHTitleMatcher()
+    bodies = SimHashIndex(body_distance) if body_distance is not None else None
     for item in items:
-        link_key = _normalize_link(item.link)
-        if link_key and link_key in seen_links:
+        link_key = item.link_key()
+        if link_key and (link_key in seen_links or (index is not None and index.has_link(link_key))):
+            continue
+        norm_title = item.features().title_key
+        if titles.has_similar(norm_title, title_threshold):
+            continue
+        if index is not None and index.has_similar_title(norm_title, title_threshold):
+            continue
+        fingerprint = item.body_fingerprint() if bodies is not None else 0
+        if fingerprint and bodies.has_near(fingerprint):
             continue
-        norm_title = _normalize_title(item.title)
-        if _has_similar_title(norm_title, normalized_titles, title_threshold):
+        if fingerprint and index is not None and index.has_similar_body(fingerprint):
             continue
         if link_key:
             seen_links.add(link_key)
-        normalized_titles.append(norm_title)
-        unique.append(item)
-    return unique
-
-
-def _normalize_link(link: str) -> str:
-    parsed = urlparse(link)
-    netloc = (parsed.hostname or parsed.netloc or "").lower()
-    path = parsed.path.rstrip("/") or "/"
-    if not netloc:
-        return ""
-    clean_query = _strip_tracking_params(parsed.query)
-    key = f"{netloc}{path}"
-    if clean_query:
-        key = f"{key}?{clean_query}"
-    return key
-
-
-def _normalize_title(title: str) -> str:
-    tokens = re.split(r"[^a-zA-Z0-9]+", title.lower())
-    cleaned: list[str] = []
-    for token in tokens:
-        if not token or token in STOPWORDS:
-            continue
-        if token.endswith("s") and len(token) > 3:
-            token = token[:-1]
-        cleaned.append(token)
-    cleaned.sort()
-    return " ".join(cleaned)
+        titles.add(norm_title)
+        if fingerprint:
+            bodies.add(len(bodies), fingerprint)
+        yield item
 
 
-def _has_similar_title(reference: str, past_titles: Iterable[str], threshold: float) -> bool:
-    return any(SequenceMatcher(a=reference, b=prev).ratio() >= threshold for prev in past_titles)
+class DedupeIndex:
+    """Size- and age-bounded record of links, titles and body fingerprints accepted by earlier runs.
+
+    Stored in ``<cache_dir>/dedupe_index.json`` oldest first. Entries older
+    than ``window`` expire, so a recurring headline ("Daily briefing") is only
+    suppressed while its last occurrence is recent; past ``max_entries`` the
+    oldest entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        max_entries: int = 5000,
+        body_distance: int | None = 3,
+        window: timedelta | None = None,
+    ):
+        self.path = cache_dir / "dedupe_index.json"
+        self.max_entries = max_entries
+        self.window = window
+        self._entries: deque[tuple[int, str, str, int, datetime]] = deque()
+        self._links: Counter[str] = Counter()
+        self._titles = _LSHTitleMatcher()
+        self._bodies = SimHashIndex(body_distance) if body_distance is not None else None
+        now = utc_now()
+        for link_key, norm_title, body, added_at in self._load():
+            self._add(link_key, norm_title, body, added_at or now)
+        self._evict(now)
+
+    def _load(self) -> list[tuple[str, str, int, datetime | None]]:
+        if not self.path.exists():
+            return []
+        try:
+            raw = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return []
+        # Entries written before the window existed have no "at"; they age from now.
+        return [
+            (
+                entry.get("link", ""),
+                entry.get("title", ""),
+                entry.get("body", 0),
+                datetime.fromisoformat(entry["at"]) if entry.get("at") else None,
+            )
+            for entry in raw.get("entries", [])
+        ]
+
+    def _save(self) -> None:
+        entries = []
+        for _, link_key, norm_title, body, added_at in self._entries:
+            entry: dict[str, object] = {"link": link_key, "title": norm_title, "at": added_at.isoformat()}
+            if body:
+                entry["body"] = body
+            entries.append(entry)
+        self.path.write_text(json.dumps({"entries": entries}))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def has_link(self, link_key: str) -> bool:
+        return link_key in self._links
 
+    def has_similar_title(self, norm_title: str, threshold: float) -> bool:
+        return self._titles.has_similar(norm_title, threshold)
 
-def _strip_tracking_params(query: str) -> str:
-    if not query:
-        return ""
-    filtered = [
-        (name, value)
-        for name, value in parse_qsl(query, keep_blank_values=True)
-        if name.lower() not in TRACKING_PARAMS
-    ]
-    if not filtered:
-        return ""
-    return urlencode(filtered, doseq=True)
+    def has_similar_body(self, fingerprint: int) -> bool:
+        return self._bodies is not None and self._bodies.has_near(fingerprint)
+
+    def remember(self, items: Iterable[NewsItem], *, now: datetime | None = None) -> None:
+        now = now or utc_now()
+        changed = False
+        for item in items:
+            self._add(item.link_key(), item.features().title_key, item.body_fingerprint(), now)
+            changed = True
+        if changed:
+            self._evict(now)
+            self._save()
+
+    def _add(self, link_key: str, norm_title: str, body: int, added_at: datetime) -> None:
+        title_id = self._titles.add(norm_title)
+        self._entries.append((title_id, link_key, norm_title, body, added_at))
+        if link_key:
+            self._links[link_key] += 1
+        if body and self._bodies is not None:
+            self._bodies.add(title_id, body)
+
+    def _evict(self, now: datetime) -> None:
+        cutoff = now - self.window if self.window is not None else None
+        while len(self._entries) > self.max_entries or (
+            cutoff is not None and self._entries and self._entries[0][4] < cutoff
+        ):
+            title_id, link_key, _, _, _ = self._entries.popleft()
+            self._titles.remove(title_id)
+            if self._bodies is not None:
+                self._bodies.remove(title_id)
+            if link_key:
+                self._links[link_key] -= 1
+                if self._links[link_key] <= 0:
+                    del self._links[link_key]
+
+
+class _ExactTitleMatcher:
+    def __init__(self) -> None:
+        self.titles: list[str] = []
+
+    def has_similar(self, title: str, threshold: float) -> bool:
+        return _has_similar_title(title, self.titles, threshold)
+
+    def add(self, title: str) -> None:
+        self.titles.append(title)
+
+
+class _LSHTitleMatcher:
+    def __init__(self) -> None:
+        self.titles: dict[int, str] = {}
+        self.exact: Counter[str] = Counter()
+        self.index = LSHIndex(_TITLE_HASHER)
+        self._next_id = 0
+        self._last: tuple[str, tuple[int, ...]] = ("", ())
+
+    def _signature(self, title: str) -> tuple[int, ...]:
+        # has_similar() and add() see the same title back to back.
+        if self._last[0] != title or not self._last[1]:
+            self._last = (title, _TITLE_HASHER.signature(title))
+        return self._last[1]
+
+    def has_similar(self, title: str, threshold: float) -> bool:
+        if self.exact[title] > 0:
+            return True
+        candidates = self.index.candidates(self._signature(title))
+        return _has_similar_title(title, (self.titles[idx] for idx in sorted(candidates)), threshold)
+
+    def add(self, title: str) -> int:
+        title_id = self._next_id
+        self._next_id += 1
+        self.index.add(title_id, self._signature(title))
+        self.titles[title_id] = title
+        self.exact[title] += 1
+        return title_id
+
+    def remove(self, title_id: int) -> None:
+        title = self.titles.pop(title_id)
+        self.index.remove(title_id, _TITLE_HASHER.signature(title))
+        self.exact[title] -= 1
+        if self.exact[title] <= 0:
+            del self.exact[title]
+
+
+def _has_similar_title(reference: str, past_titles: Iterable[str], threshold: float) -> bool:
+    return any(SequenceMatcher(a=reference, b=prev).ratio() >= threshold for prev in past_titles)
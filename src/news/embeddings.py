@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+from array import array
+from collections import Counter
+from operator import add, mul
+from pathlib import Path
+from typing import Protocol, Sequence
+
+from .cluster import clusters_from_groups
+from .models import Cluster, NewsItem, newest_first
+
+try:  # Optional: vectorizes the nearest-centroid search.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised by monkeypatching np to None
+    np = None
+
+# Titles and ledes carry the event; the rest of a long body only adds noise.
+_EMBED_CHARS = 1000
+
+
+class Embedder(Protocol):
+    def embed(self, texts: Sequence[str]) -> list[list[float]]: ...
+
+
+class EmbeddingCache:
+    """Unit-length float32 embeddings in ``<cache_dir>/embeddings.json``.
+
+    Entries are keyed by model and a SHA-256 of the embedded text, so an item
+    is embedded once per model however often it is clustered. On flush the
+    oldest entries are evicted past ``max_entries`` per model.
+    """
+
+    def __init__(self, cache_dir: Path, model: str, *, max_entries: int = 20000):
+        self.path = cache_dir / "embeddings.json"
+        self.model = model
+        self.max_entries = max_entries
+        self._data = self._load()
+        self._vectors = self._data.setdefault(model, {})
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def get(self, text: str) -> array | None:
+        encoded = self._vectors.get(_content_hash(text))
+        if encoded is None:
+            return None
+        vector = array("f")
+        vector.frombytes(base64.b64decode(encoded))
+        return vector
+
+    def put(self, text: str, vector: Sequence[float]) -> array:
+        """Store ``vector`` normalized to unit length and return the stored vector."""
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        packed = array("f", (value / norm for value in vector))
+        self._vectors[_content_hash(text)] = base64.b64encode(packed.tobytes()).decode("ascii")
+        self._dirty = True
+        return packed
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        while len(self._vectors) > self.max_entries:
+            del self._vectors[next(iter(self._vectors))]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._data))
+        self._dirty = False
+
+
+def embed_items(
+    items: Sequence[NewsItem],
+    embedder: Embedder,
+    cache: EmbeddingCache,
+    *,
+    batch_size: int = 32,
+) -> list[array]:
+    """Embeddings for ``items``, calling ``embedder`` in batches only for texts not cached yet."""
+    texts = [_embed_text(item) for item in items]
+    # Collected locally: cache entries may be evicted before the run ends.
+    vectors: dict[str, array] = {}
+    missing: list[str] = []
+    for text in dict.fromkeys(texts):
+        cached = cache.get(text)
+        if cached is None:
+            missing.append(text)
+        else:
+            vectors[text] = cached
+    try:
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            for text, vector in zip(batch, embedder.embed(batch)):
+                vectors[text] = cache.put(text, vector)
+    finally:
+        cache.flush()
+    return [vectors[text] for text in texts]
+
+
+def cluster_by_embedding(
+    items: Sequence[NewsItem],
+    embedder: Embedder,
+    cache: EmbeddingCache,
+    *,
+    similarity_threshold: float = 0.8,
+    max_items: int | None = None,
+    batch_size: int = 32,
+) -> list[Cluster]:
+    """Cluster on embedding cosine; each item joins its nearest centroid at or above the threshold."""
+    ordered = newest_first(items)
+    if max_items is not None:
+        ordered = ordered[:max_items]
+    vectors = embed_items(ordered, embedder, cache, batch_size=batch_size)
+    groups: list[list[NewsItem]] = []
+    token_counts: list[Counter[str]] = []
+    for item, label in zip(ordered, nearest_centroid_labels(vectors, similarity_threshold)):
+        if label == len(groups):
+            groups.append([])
+            token_counts.append(Counter())
+        groups[label].append(item)
+        token_counts[label].update(item.features().token_counts)
+    return clusters_from_groups(groups, token_counts)
+
+
+def nearest_centroid_labels(vectors: Sequence[array], threshold: float) -> list[int]:
+    """Greedy assignment over centroid sums kept in one flat float32 array."""
+    if not vectors:
+        return []
+    dim = len(vectors[0])
+    sums = array("f")
+    norms: list[float] = []
+    labels: list[int] = []
+    for vector in vectors:
+        best: int | None = None
+        best_score = threshold
+        for idx, dot in enumerate(_dot_rows(sums, vector, dim)):
+            score = dot / norms[idx] if norms[idx] else 0.0
+            if score > best_score or (best is None and score >= threshold):
+                best, best_score = idx, score
+        if best is None:
+            best = len(norms)
+            sums.extend(vector)
+            norms.append(_norm(vector))
+        else:
+            low, high = best * dim, (best + 1) * dim
+            sums[low:high] = array("f", map(add, sums[low:high], vector))
+            norms[best] = _norm(sums[low:high])
+        labels.append(best)
+    return labels
+
+
+def _dot_rows(rows: array, vector: array, dim: int) -> list[float]:
+    if not rows:
+        return []
+    if np is not None:
+        matrix = np.frombuffer(rows, dtype=np.float32).reshape(-1, dim)
+        return (matrix @ np.frombuffer(vector, dtype=np.float32)).tolist()
+    return [sum(map(mul, rows[low : low + dim], vector)) for low in range(0, len(rows), dim)]
+
+
+def _norm(vector: Sequence[float]) -> float:
+    return math.sqrt(sum(value * value for value in vector))
+
+
+def _embed_text(item: NewsItem) -> str:
+    return "\n".join(part for part in (item.title, item.summary or "") if part)[:_EMBED_CHARS]
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
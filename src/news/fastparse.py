@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import html
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+
+_RSS_ITEM = "item"
+_ATOM_ENTRY = f"{{{ATOM_NS}}}entry"
+_CHUNK_SIZE = 64 * 1024
+
+
+class FastParseError(ValueError):
+    """Input the fast path does not handle exactly like feedparser."""
+
+
+@dataclass(slots=True)
+class FastFeed:
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    feed: dict[str, Any] = field(default_factory=dict)
+
+
+def parse_feed(body: bytes, *, limit: int) -> FastFeed:
+    """Incrementally parse well-formed RSS 2.0 / Atom into feedparser-shaped entries.
+
+    Parsing stops once ``limit`` entries were read, so the rest of a large
+    document is never tokenized. Entities are decoded and escaped HTML is
+    kept as text (feedparser would sanitize it; downstream stages strip
+    markup anyway). Structural problems (malformed XML, other dialects,
+    inline XHTML, RSS ``<author>``) raise ``FastParseError`` so the caller
+    can fall back to feedparser.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    result = FastFeed()
+    entry_tag: str | None = None
+    depth = 0
+    entry_depth = 0
+    try:
+        for offset in range(0, max(len(body), 1), _CHUNK_SIZE):
+            parser.feed(body[offset : offset + _CHUNK_SIZE])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        entry_tag = _entry_tag_for_root(elem)
+                    elif elem.tag == entry_tag:
+                        entry_depth = depth
+                    continue
+                if elem.tag == entry_tag and depth == entry_depth:
+                    convert = _rss_entry if entry_tag == _RSS_ITEM else _atom_entry
+                    result.entries.append(convert(elem))
+                    elem.clear()
+                    entry_depth = 0
+                    if len(result.entries) >= limit:
+                        return result
+                elif not entry_depth and elem.tag == "ttl" and elem.text:
+                    result.feed["ttl"] = elem.text.strip()
+                depth -= 1
+        parser.close()
+    except ET.ParseError as exc:
+        raise FastParseError(f"Malformed XML: {exc}") from exc
+    if entry_tag is None:
+        raise FastParseError("Empty document")
+    return result
+
+
+def _entry_tag_for_root(root: ET.Element) -> str:
+    if root.tag == "rss" and root.get("version", "").startswith("2."):
+        return _RSS_ITEM
+    if root.tag == f"{{{ATOM_NS}}}feed":
+        return _ATOM_ENTRY
+    raise FastParseError(f"Unsupported feed root {root.tag!r}")
+
+
+def _rss_entry(elem: ET.Element) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    _set_text(entry, "title", elem.findtext("title"))
+    _set_text(entry, "link", elem.findtext("link"), markup_ok=True)
+    guid = elem.find("guid")
+    if guid is not None and guid.text and guid.text.strip():
+        entry["id"] = guid.text.strip()
+        if "link" not in entry and guid.get("isPermaLink", "true") == "true":
+            entry["link"] = entry["id"]
+    _set_text(entry, "summary", elem.findtext("description"))
+    encoded = elem.findtext(f"{{{CONTENT_NS}}}encoded")
+    if encoded and encoded.strip():
+        entry["content"] = [{"value": _plain(encoded.strip())}]
+        entry.setdefault("summary", entry["content"][0]["value"])
+    published = elem.findtext("pubDate")
+    if published:
+        entry["published_parsed"] = entry["updated_parsed"] = _rfc822_struct(published)
+    tags = [c.text.strip() for c in elem.findall("category") if c.text and c.text.strip()]
+    if tags:
+        entry["tags"] = [{"term": _plain(tag)} for tag in tags]
+    creators = [c.text.strip() for c in elem.findall(f"{{{DC_NS}}}creator") if c.text and c.text.strip()]
+    if creators:
+        entry["authors"] = [{"name": _plain(name)} for name in creators]
+    elif elem.find("author") is not None:
+        # feedparser splits "email (Name)" forms; leave those to it.
+        raise FastParseError("RSS <author> needs feedparser")
+    return entry
+
+
+def _atom_entry(elem: ET.Element) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    _set_text(entry, "title", _atom_text(elem.find(f"{{{ATOM_NS}}}title")))
+    link = _atom_link(elem)
+    if link:
+        entry["link"] = link
+    _set_text(entry, "id", elem.findtext(f"{{{ATOM_NS}}}id"), markup_ok=True)
+    _set_text(entry, "summary", _atom_text(elem.find(f"{{{ATOM_NS}}}summary")))
+    content = _atom_text(elem.find(f"{{{ATOM_NS}}}content"))
+    if content:
+        entry["content"] = [{"value": content}]
+        entry.setdefault("summary", content)
+    published = elem.findtext(f"{{{ATOM_NS}}}published")
+    updated = elem.findtext(f"{{{ATOM_NS}}}updated")
+    if published:
+        entry["published_parsed"] = _iso_struct(published)
+    if updated:
+        entry["updated_parsed"] = _iso_struct(updated)
+    tags = [c.get("term", "").strip() for c in elem.findall(f"{{{ATOM_NS}}}category")]
+    if any(tags):
+        entry["tags"] = [{"term": _plain(tag)} for tag in tags if tag]
+    authors = [a.findtext(f"{{{ATOM_NS}}}name") for a in elem.findall(f"{{{ATOM_NS}}}author")]
+    names = [name.strip() for name in authors if name and name.strip()]
+    if names:
+        entry["authors"] = [{"name": _plain(name)} for name in names]
+    return entry
+
+
+def _atom_link(elem: ET.Element) -> str | None:
+    links = elem.findall(f"{{{ATOM_NS}}}link")
+    for link in links:
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href", "").strip()
+    return None
+
+
+def _atom_text(elem: ET.Element | None) -> str | None:
+    if elem is None:
+        return None
+    if elem.get("type", "text") not in ("text", "html") or len(elem):
+        raise FastParseError("Inline XHTML content needs feedparser")
+    return elem.text
+
+
+def _set_text(entry: dict[str, Any], key: str, value: str | None, *, markup_ok: bool = False) -> None:
+    # URLs are not sanitized by feedparser, so "&" in a query string is fine.
+    if value is None:
+        return
+    value = value.strip()
+    if value:
+        entry[key] = value if markup_ok else _plain(value)
+
+
+def _plain(text: str) -> str:
+    # The XML parser already resolved one level of escaping; feeds routinely
+    # double-escape entities inside escaped HTML (``&amp;amp;``).
+    return html.unescape(text) if "&" in text else text
+
+
+def _rfc822_struct(value: str) -> time.struct_time:
+    try:
+        parsed = parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError) as exc:
+        raise FastParseError(f"Unparseable date {value!r}") from exc
+    return _utc_struct(parsed)
+
+
+def _iso_struct(value: str) -> time.struct_time:
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError as exc:
+        raise FastParseError(f"Unparseable date {value!r}") from exc
+    return _utc_struct(parsed)
+
+
+def _utc_struct(value: datetime) -> time.struct_time:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.utctimetuple()
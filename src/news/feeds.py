@@ -1,49 +1,135 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from datetime import datetime, timezone
-from typing import Any, Callable, Sequence
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Sequence
 
 import feedparser
 import requests
 
-from .config import FeedConfig, Settings
-from .models import NewsItem
+from .config import FeedConfig, Settings, parse_duration
+from .fastparse import FastParseError, parse_feed
+from .links import canonical_link
+from .models import NewsItem, utc_now
+from .telemetry import FetchSample, FetchStatsStore
+from .transport import take_connect_time
+
+if TYPE_CHECKING:
+    from .cache import CacheStore
 
 log = logging.getLogger(__name__)
 
+_SKIP_HOURS_RE = re.compile(rb"<skipHours>(.*?)</skipHours>", re.IGNORECASE | re.DOTALL)
+_HOUR_RE = re.compile(rb"<hour>\s*(\d{1,2})\s*</hour>", re.IGNORECASE)
+_READ_CHUNK_SIZE = 64 * 1024
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)", re.IGNORECASE)
+
 
 class FeedError(RuntimeError):
     pass
 
 
+class FeedTooLargeError(FeedError):
+    pass
+
+
 def fetch_feed(
     feed: FeedConfig,
     settings: Settings,
     *,
     session: requests.Session | None = None,
     max_retries: int = 2,
+    cache: CacheStore | None = None,
+    telemetry: FetchStatsStore | None = None,
+) -> list[NewsItem]:
+    sample = FetchSample(feed=feed.name, url=feed.url)
+    try:
+        items = _fetch_feed(feed, settings, session, max_retries, cache, sample)
+        sample.items = len(items)
+        return items
+    except Exception:
+        # Anything that escapes (not just FeedError) is a failed fetch.
+        if sample.status == "ok":
+            sample.status = "error"
+        raise
+    finally:
+        if telemetry is not None:
+            telemetry.record(sample)
+
+
+def _fetch_feed(
+    feed: FeedConfig,
+    settings: Settings,
+    session: requests.Session | None,
+    max_retries: int,
+    cache: CacheStore | None,
+    sample: FetchSample,
 ) -> list[NewsItem]:
+    state = cache.feed_state(feed.url) if cache is not None else {}
+    fetched_at = utc_now()
+    open_until = state.get("breaker_open_until")
+    if open_until and datetime.fromisoformat(open_until) > fetched_at:
+        log.info("Skipping %s: circuit open until %s", feed.url, open_until)
+        sample.status = "circuit_open"
+        raise FeedError(f"Circuit open for {feed.url} until {open_until}")
+
     sess = session or requests.Session()
     created_session = session is None
+    headers = {"User-Agent": settings.user_agent}
+    # Only revalidate when the items of the cached body can be served on a 304.
+    if cache is not None and cache.has_parsed_items(feed.url, state.get("content_hash")):
+        headers.update(_conditional_headers(state))
+    limit = feed.max_bytes or settings.max_feed_bytes
     response = None
+    body = b""
     error: Exception | None = None
+    backoff_left = settings.retry_backoff_budget_s
     for attempt in range(max_retries + 1):
         try:
+            take_connect_time()
+            started = time.perf_counter()
             response = sess.get(
                 feed.url,
-                headers={"User-Agent": settings.user_agent},
+                headers=headers,
                 timeout=settings.timeout_s,
+                stream=True,
             )
+            sample.ttfb_s = time.perf_counter() - started
+            sample.connect_s = take_connect_time()
             response.raise_for_status()
+            started = time.perf_counter()
+            body = _read_body(feed, response, limit, early_abort=settings.early_abort_oversize)
+            sample.download_s = time.perf_counter() - started
+            sample.bytes = len(body)
             break
+        except FeedTooLargeError as exc:
+            log.warning("Dropping %s: %s", feed.url, exc)
+            sample.status = "too_large"
+            if created_session:
+                sess.close()
+            if cache is not None:
+                _record_failure(cache, feed, state, fetched_at, settings)
+            raise
         except requests.RequestException as exc:
             error = exc
+            if exc.response is not None:
+                exc.response.close()
             log.warning("Failed to fetch %s (attempt %s/%s): %s", feed.url, attempt + 1, max_retries + 1, exc)
-            if attempt == max_retries:
+            if attempt == max_retries or not _is_retryable(exc) or backoff_left <= 0:
                 if created_session:
                     sess.close()
+                if cache is not None:
+                    _record_failure(cache, feed, state, fetched_at, settings)
                 raise FeedError(str(exc)) from exc
+            delay = min(_backoff_delay(attempt, settings), backoff_left)
+            backoff_left -= delay
+            time.sleep(delay)
     else:
         raise FeedError(f"Unable to fetch {feed.url}: {error}") from error
 
@@ -51,15 +137,67 @@ def fetch_feed(
     if created_session:
         sess.close()
 
-    parsed = feedparser.parse(response.content)
-    if parsed.bozo and parsed.bozo_exception:
-        log.warning("Feed parser warning for %s: %s", feed.url, parsed.bozo_exception)
+    fetch_state: dict[str, Any] = {
+        "last_fetch": fetched_at.isoformat(),
+        "failures": None,
+        "breaker_open_until": None,
+        "fresh_until": _fresh_until(response.headers, fetched_at),
+    }
+    if response.status_code == 304:
+        sample.status = "not_modified"
+        log.debug("Feed %s not modified since last fetch", feed.url)
+        if cache is not None:
+            cache.update_feed_state(feed.url, changed=False, **fetch_state)
+            return cache.parsed_items(feed.url, state.get("content_hash")) or []
+        return []
 
+    body_hash = hashlib.sha256(body).hexdigest()
+    cached_items = cache.parsed_items(feed.url, body_hash) if cache is not None else None
+    if cached_items is not None and state.get("content_hash") == body_hash:
+        log.debug("Feed %s body unchanged, skipping parse", feed.url)
+        sample.status = "unchanged"
+        cache.update_feed_state(
+            feed.url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            changed=False,
+            **fetch_state,
+        )
+        return cached_items
+
+    started = time.perf_counter()
+    entries, feed_meta = _parse_entries(feed, body, settings)
     items: list[NewsItem] = []
-    for entry in parsed.entries[: settings.max_items_per_feed]:
+    for entry in entries:
         item = _entry_to_news_item(feed, entry)
         if item:
             items.append(item)
+    sample.parse_s = time.perf_counter() - started
+    sample.entries = len(entries)
+
+    if cache is not None:
+        newest = max((item.published_dt for item in items if item.published_dt), default=None)
+        newest_iso = newest.isoformat() if newest else None
+        entries_hash = _entries_hash(items)
+        if newest_iso is not None:
+            changed = newest_iso != state.get("newest_item")
+        else:
+            # Undated entries: the body may differ only in e.g. <lastBuildDate>,
+            # so compare the entries themselves.
+            changed = entries_hash != state.get("entries_hash")
+        cache.update_feed_state(
+            feed.url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            changed=changed,
+            newest_item=newest_iso,
+            entries_hash=entries_hash,
+            ttl_s=_feed_ttl_seconds(feed_meta),
+            skip_hours=_skip_hours(body),
+            content_hash=body_hash,
+            **fetch_state,
+        )
+        cache.remember_parsed_items(feed.url, body_hash, items)
     return items
 
 
@@ -67,18 +205,179 @@ def fetch_all_feeds(
     feeds: Sequence[FeedConfig],
     settings: Settings,
     session_factory: Callable[[], requests.Session] | None = None,
+    *,
+    cache: CacheStore | None = None,
+    session: requests.Session | None = None,
+    telemetry: FetchStatsStore | None = None,
 ) -> list[NewsItem]:
-    items: list[NewsItem] = []
-    for feed in feeds:
+    """Fetch every feed, in parallel when ``settings.fetch_concurrency`` > 1.
+
+    Failing feeds are skipped; items are returned in feed order regardless of
+    which download finishes first. A shared ``session`` (e.g. from
+    ``HttpTransport``) is reused for every feed and left open for the caller.
+    """
+    return list(iter_all_feeds(feeds, settings, session_factory, cache=cache, session=session, telemetry=telemetry))
+
+
+def iter_all_feeds(
+    feeds: Sequence[FeedConfig],
+    settings: Settings,
+    session_factory: Callable[[], requests.Session] | None = None,
+    *,
+    cache: CacheStore | None = None,
+    session: requests.Session | None = None,
+    telemetry: FetchStatsStore | None = None,
+) -> Iterator[NewsItem]:
+    """Streaming form of ``fetch_all_feeds``.
+
+    Each feed's items are yielded as soon as that feed and every feed before
+    it have been parsed, so consumers start work before the slowest download
+    finishes while the output order stays deterministic.
+    """
+
+    def fetch_one(feed: FeedConfig) -> list[NewsItem]:
         sess = session_factory() if session_factory else None
         try:
-            items.extend(fetch_feed(feed, settings, session=sess))
+            return fetch_feed(feed, settings, session=sess or session, cache=cache, telemetry=telemetry)
         except FeedError:
-            continue
+            return []
         finally:
             if sess is not None:
                 sess.close()
-    return items
+
+    workers = min(settings.fetch_concurrency, len(feeds))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") if workers > 1 else None
+    try:
+        results = pool.map(fetch_one, feeds) if pool else map(fetch_one, feeds)
+        for feed_items in results:
+            yield from feed_items
+    finally:
+        if pool is not None:
+            # A consumer that stops early (e.g. --max-items) drops pending feeds.
+            pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.flush()
+        if telemetry is not None:
+            telemetry.flush()
+
+
+def _read_body(feed: FeedConfig, response: requests.Response, limit: int, *, early_abort: bool) -> bytes:
+    """Stream the body into memory, refusing to hold more than ``limit`` bytes."""
+    try:
+        declared = response.headers.get("Content-Length")
+        if early_abort and declared and declared.isdigit() and int(declared) > limit:
+            raise FeedTooLargeError(f"{feed.url} declares {declared} bytes (limit {limit})")
+        chunks: list[bytes] = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=_READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise FeedTooLargeError(f"{feed.url} exceeded {limit} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        response.close()
+
+
+def _entries_hash(items: Sequence[NewsItem]) -> str:
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(f"{item.link}\0{item.title}\0".encode())
+    return digest.hexdigest()
+
+
+def _is_retryable(exc: requests.RequestException) -> bool:
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        return True
+    return status >= 500 or status in (408, 429)
+
+
+def _backoff_delay(attempt: int, settings: Settings) -> float:
+    """Exponential backoff with full jitter for the given 0-based attempt."""
+    ceiling = min(settings.retry_backoff_s * (2**attempt), settings.retry_backoff_max_s)
+    return random.uniform(0, ceiling)
+
+
+def _record_failure(
+    cache: CacheStore,
+    feed: FeedConfig,
+    state: dict[str, Any],
+    failed_at: datetime,
+    settings: Settings,
+) -> None:
+    failures = state.get("failures", 0) + 1
+    open_until = None
+    if failures >= settings.breaker_threshold:
+        extra = min(failures - settings.breaker_threshold, 4)
+        cooldown = parse_duration(settings.breaker_cooldown) * (2**extra)
+        open_until = (failed_at + cooldown).isoformat()
+        log.warning("Opening circuit for %s after %s failed fetches (until %s)", feed.url, failures, open_until)
+    cache.update_feed_state(
+        feed.url,
+        last_fetch=failed_at.isoformat(),
+        failures=failures,
+        breaker_open_until=open_until,
+    )
+
+
+def _parse_entries(feed: FeedConfig, body: bytes, settings: Settings) -> tuple[list[Any], Any]:
+    limit = settings.max_items_per_feed
+    if settings.fast_parser:
+        try:
+            fast = parse_feed(body, limit=limit)
+            return fast.entries, fast.feed
+        except FastParseError as exc:
+            log.debug("Fast parser fell back to feedparser for %s: %s", feed.url, exc)
+    parsed = feedparser.parse(body)
+    if parsed.bozo and parsed.bozo_exception:
+        log.warning("Feed parser warning for %s: %s", feed.url, parsed.bozo_exception)
+    return parsed.entries[:limit], parsed.feed
+
+
+def _feed_ttl_seconds(feed_meta: Any) -> int | None:
+    ttl = feed_meta.get("ttl") if feed_meta else None
+    try:
+        return int(ttl) * 60 if ttl else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _skip_hours(body: bytes) -> list[int] | None:
+    # feedparser keeps only the last <hour> of <skipHours>, so read them directly.
+    match = _SKIP_HOURS_RE.search(body)
+    if not match:
+        return None
+    hours = sorted({int(hour) for hour in _HOUR_RE.findall(match.group(1)) if int(hour) < 24})
+    return hours or None
+
+
+def _fresh_until(headers: Any, fetched_at: datetime) -> str | None:
+    """Expiry implied by ``Cache-Control: max-age`` or ``Expires``, if any."""
+    cache_control = headers.get("Cache-Control") or ""
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        return (fetched_at + timedelta(seconds=int(match.group(1)))).isoformat()
+    expires = headers.get("Expires")
+    if not expires:
+        return None
+    try:
+        expires_dt = parsedate_to_datetime(expires)
+    except (TypeError, ValueError):
+        return None
+    if expires_dt.tzinfo is None:
+        expires_dt = expires_dt.replace(tzinfo=timezone.utc)
+    return expires_dt.isoformat()
+
+
+def _conditional_headers(state: dict[str, Any]) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
 
 
 def _entry_to_news_item(feed: FeedConfig, entry: Any) -> NewsItem | None:
@@ -93,10 +392,11 @@ def _entry_to_news_item(feed: FeedConfig, entry: Any) -> NewsItem | None:
     entry_tags = [tag.get("term", "").lower() for tag in entry.get("tags", [])]
     tags = [tag for tag in dict.fromkeys([*entry_tags, *feed.tags]) if tag]
     authors = [author.get("name", "") for author in entry.get("authors", []) if author.get("name")]
+    link = link.strip()
     return NewsItem(
         id=str(entry_id),
         title=title.strip(),
-        link=link.strip(),
+        link=link,
         source=feed.name,
         published_dt=published,
         summary=summary.strip() if summary else None,
@@ -104,6 +404,7 @@ def _entry_to_news_item(feed: FeedConfig, entry: Any) -> NewsItem | None:
         tags=tags,
         authors=authors,
         raw={"entry_id": entry_id},
+        canonical_link=canonical_link(link),
     )
 
 
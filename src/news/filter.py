@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, Sequence
-from urllib.parse import urlparse
+from typing import Iterable, Iterator, Sequence
 
+from .links import link_host
 from .models import FilterOptions, NewsItem
 
 
@@ -12,8 +12,13 @@ class FilterError(RuntimeError):
 
 
 def apply_filters(items: Sequence[NewsItem], options: FilterOptions) -> list[NewsItem]:
+    return list(iter_filtered(items, options))
+
+
+def iter_filtered(items: Iterable[NewsItem], options: FilterOptions) -> Iterator[NewsItem]:
+    """Incremental ``apply_filters``; stops pulling items once ``max_items`` is reached."""
     opts = options.normalized()
-    filtered: list[NewsItem] = []
+    kept = 0
     for item in items:
         if opts.since and item.published_dt and item.published_dt < opts.since:
             continue
@@ -25,32 +30,24 @@ def apply_filters(items: Sequence[NewsItem], options: FilterOptions) -> list[New
             continue
         if opts.tags and not _matches_tags(item, opts.tags):
             continue
-        filtered.append(item)
-        if opts.max_items and len(filtered) >= opts.max_items:
-            break
-    return filtered
+        yield item
+        kept += 1
+        if opts.max_items and kept >= opts.max_items:
+            return
 
 
 def _matches_keywords(item: NewsItem, keywords: Iterable[str]) -> bool:
-    text = item.text_blob().lower()
+    text = item.features().blob
     return any(keyword in text for keyword in keywords)
 
 
 def _matches_domain(item: NewsItem, domains: Iterable[str]) -> bool:
-    host = _extract_host(item.link)
+    host = link_host(item.link_key())
     if not host:
         return False
-    host = host.lower()
     return any(host == domain or host.endswith(f".{domain}") for domain in domains)
 
 
 def _matches_tags(item: NewsItem, tags: Iterable[str]) -> bool:
     item_tags = {tag.lower() for tag in item.tags}
     return any(tag in item_tags for tag in tags)
-
-
-def _extract_host(url: str) -> str:
-    try:
-        return urlparse(url).hostname or ""
-    except ValueError:
-        return ""
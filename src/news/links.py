@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+TRACKING_PARAMS = {
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "utm_term",
+    "utm_content",
+    "utm_id",
+    "utm_name",
+    "utm_reader",
+    "utm_place",
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "icmpid",
+    "ref",
+}
+
+
+def canonical_link(link: str) -> str:
+    """``host/path?query`` without scheme, trailing slash or tracking params.
+
+    Returns ``""`` for links without a host (or that cannot be parsed).
+    """
+    try:
+        parsed = urlparse(link)
+        netloc = (parsed.hostname or parsed.netloc or "").lower()
+    except ValueError:
+        return ""
+    path = parsed.path.rstrip("/") or "/"
+    if not netloc:
+        return ""
+    clean_query = strip_tracking_params(parsed.query)
+    key = f"{netloc}{path}"
+    if clean_query:
+        key = f"{key}?{clean_query}"
+    return key
+
+
+def link_host(key: str) -> str:
+    """Host part of a ``canonical_link`` key."""
+    return key.split("/", 1)[0]
+
+
+def strip_tracking_params(query: str) -> str:
+    if not query:
+        return ""
+    filtered = [
+        (name, value)
+        for name, value in parse_qsl(query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS
+    ]
+    if not filtered:
+        return ""
+    return urlencode(filtered, doseq=True)
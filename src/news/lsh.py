@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+import zlib
+from collections import defaultdict
+from typing import Hashable, Iterable
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_SEED = 0x5EED
+
+
+class MinHasher:
+    """MinHash signatures over character shingles.
+
+    Signatures are deterministic across runs (fixed seed and crc32 shingle
+    hashes), so band keys can be persisted and compared later.
+    """
+
+    def __init__(self, num_perm: int = 32, shingle_size: int = 3, seed: int = _SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> set[str]:
+        size = self.shingle_size
+        if len(text) <= size:
+            return {text} if text else set()
+        return {text[idx : idx + size] for idx in range(len(text) - size + 1)}
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        hashes = [zlib.crc32(shingle.encode()) for shingle in self.shingles(text)]
+        if not hashes:
+            return ()
+        return tuple(min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._perms)
+
+
+class LSHIndex:
+    """Banded MinHash index returning items whose signatures collide in any band.
+
+    With ``bands`` x ``rows`` = ``num_perm``, a pair with Jaccard similarity s
+    becomes a candidate with probability 1 - (1 - s**rows) ** bands.
+    """
+
+    def __init__(self, hasher: MinHasher | None = None, *, bands: int = 16):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self._buckets: dict[tuple[int, int], list[Hashable]] = defaultdict(list)
+
+    def band_keys(self, signature: tuple[int, ...]) -> list[tuple[int, int]]:
+        if not signature:
+            return []
+        rows = self.rows
+        return [(band, hash(signature[band * rows : (band + 1) * rows])) for band in range(self.bands)]
+
+    def add(self, key: Hashable, signature: tuple[int, ...]) -> None:
+        for band_key in self.band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def remove(self, key: Hashable, signature: tuple[int, ...]) -> None:
+        for band_key in self.band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def candidates(self, signature: tuple[int, ...]) -> list[Hashable]:
+        """Keys sharing at least one band with ``signature``, without duplicates."""
+        seen: dict[Hashable, None] = {}
+        for band_key in self.band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                seen.setdefault(key, None)
+        return list(seen)
+
+    def extend(self, entries: Iterable[tuple[Hashable, tuple[int, ...]]]) -> None:
+        for key, signature in entries:
+            self.add(key, signature)
@@ -4,6 +4,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Iterable, Sequence
 
+from . import links, simhash
+from .text import TextFeatures
+
 
 def utc_now() -> datetime:
     return datetime.now(tz=timezone.utc)
@@ -23,6 +26,61 @@ class NewsItem:
     tags: list[str] = field(default_factory=list)
     authors: list[str] = field(default_factory=list)
     raw: dict[str, Any] | None = None
+    canonical_link: str | None = field(default=None, compare=False)
+    body_simhash: int | None = field(default=None, init=False, compare=False)
+    text_features: TextFeatures | None = field(default=None, init=False, compare=False, repr=False)
+
+    def link_key(self) -> str:
+        """Canonical link (``links.canonical_link``), computed once per item."""
+        if self.canonical_link is None:
+            self.canonical_link = links.canonical_link(self.link)
+        return self.canonical_link
+
+    def body_fingerprint(self) -> int:
+        """SimHash of summary + content, computed once; 0 for bodies too short to fingerprint."""
+        if self.body_simhash is None:
+            parts = dict.fromkeys(part for part in (self.summary, self.content) if part)
+            self.body_simhash = simhash.simhash("\n".join(parts))
+        return self.body_simhash
+
+    def features(self) -> TextFeatures:
+        """Memoized tokens, lowercased blob and title key shared by dedupe, filter and cluster."""
+        if self.text_features is None:
+            self.text_features = TextFeatures(self.title, self.summary, self.content)
+        return self.text_features
+
+    def to_dict(self, *, text_chars: int | None = None) -> dict[str, Any]:
+        """JSON-safe fields for on-disk stores; ``text_chars`` truncates summary and content."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "link": self.link,
+            "source": self.source,
+            "published_dt": self.published_dt.isoformat() if self.published_dt else None,
+            "summary": self.summary[:text_chars] if self.summary else None,
+            "content": self.content[:text_chars] if self.content else None,
+            "tags": self.tags,
+            "authors": self.authors,
+            "raw": self.raw,
+            "canonical_link": self.canonical_link,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> NewsItem:
+        published = raw.get("published_dt")
+        return cls(
+            id=raw["id"],
+            title=raw["title"],
+            link=raw["link"],
+            source=raw["source"],
+            published_dt=datetime.fromisoformat(published) if published else None,
+            summary=raw.get("summary"),
+            content=raw.get("content"),
+            tags=raw.get("tags", []),
+            authors=raw.get("authors", []),
+            raw=raw.get("raw"),
+            canonical_link=raw.get("canonical_link"),
+        )
 
     def text_blob(self) -> str:
         """Aggregate fields for keyword matching."""
@@ -88,6 +146,8 @@ class PipelineOptions:
     threshold: float = 0.55
     max_items: int | None = None
     llm_enabled: bool = True
+    stream: bool = False
+    cluster_engine: str | None = None
 
     def clamp(self) -> "PipelineOptions":
         threshold = min(max(self.threshold, 0.0), 1.0)
@@ -96,6 +156,8 @@ class PipelineOptions:
             threshold=threshold,
             max_items=self.max_items,
             llm_enabled=self.llm_enabled,
+            stream=self.stream,
+            cluster_engine=self.cluster_engine,
         )
 
 
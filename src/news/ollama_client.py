@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Sequence
 
 import requests
 
-from .models import Cluster, NewsItem
+from .models import Cluster, NewsItem, utc_now
+from .prompt import DEFAULT_TOKEN_BUDGET, build_cluster_prompt, estimate_tokens
 
 log = logging.getLogger(__name__)
 
@@ -19,16 +26,29 @@ class OllamaConfig:
     base_url: str
     model: str
     timeout_s: int
+    embed_model: str = "nomic-embed-text"
+    stream: bool = False
+    # Streaming only: seconds a single generation may take before it is abandoned.
+    token_deadline_s: float | None = None
+    # How long Ollama keeps the model loaded after a request: a duration ("30m")
+    # or seconds, sent as a JSON number (-1 = forever); None = server default.
+    keep_alive: int | str | None = None
+    prompt_token_budget: int = DEFAULT_TOKEN_BUDGET
+    # Ollama generation options; None leaves the model's default.
+    num_ctx: int | None = None
+    num_predict: int | None = None
 
 
 class OllamaClient:
-    def __init__(self, config: OllamaConfig):
+    def __init__(self, config: OllamaConfig, *, session: requests.Session | None = None):
         self.config = config
         self._base = config.base_url.rstrip("/")
+        # Without a pooled session fall back to one-shot module-level requests.
+        self._http = session or requests
 
     def is_available(self) -> bool:
         try:
-            response = requests.get(f"{self._base}/api/tags", timeout=5)
+            response = self._http.get(f"{self._base}/api/tags", timeout=5)
             response.raise_for_status()
             models = response.json().get("models", [])
             return any(m.get("name") == self.config.model for m in models) or bool(models)
@@ -36,15 +56,75 @@ class OllamaClient:
             log.debug("Ollama availability check failed: %s", exc)
             return False
 
-    def summarize_cluster(self, cluster: Cluster, items: list[NewsItem], *, max_items: int = 5) -> str:
-        prompt = self._build_prompt(cluster, items, max_items=max_items)
-        payload = {
-            "model": self.config.model,
-            "prompt": prompt,
-            "stream": False,
+    def warm_up(self) -> bool:
+        """Load the model (a prompt-less ``/api/generate``) so the first summary skips the load."""
+        payload = self._generate_payload()
+        started = time.perf_counter()
+        try:
+            response = self._http.post(f"{self._base}/api/generate", json=payload, timeout=self.config.timeout_s)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            log.debug("Ollama warm-up failed: %s", exc)
+            return False
+        log.debug("Ollama model %s loaded in %.2fs", self.config.model, time.perf_counter() - started)
+        return True
+
+    def start_warm_up(self) -> threading.Thread:
+        """Run ``warm_up`` in a background thread, e.g. while feeds are fetched."""
+        thread = threading.Thread(target=self.warm_up, name="ollama-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _with_keep_alive(self, payload: dict[str, object]) -> dict[str, object]:
+        if self.config.keep_alive is not None:
+            payload["keep_alive"] = self.config.keep_alive
+        return payload
+
+    def generation_options(self) -> dict[str, object]:
+        """Ollama ``options`` sent with every generation (part of the summary cache key)."""
+        return {
+            key: value
+            for key, value in (("num_ctx", self.config.num_ctx), ("num_predict", self.config.num_predict))
+            if value is not None
         }
+
+    def _generate_payload(self, **fields: object) -> dict[str, object]:
+        # Warm-up sends the same options: a different num_ctx would reload the model.
+        options = self.generation_options()
+        payload: dict[str, object] = {"model": self.config.model, **fields}
+        if options:
+            payload["options"] = options
+        return self._with_keep_alive(payload)
+
+    def build_prompt(self, cluster: Cluster, items: list[NewsItem], *, max_items: int = 5) -> str:
+        return build_cluster_prompt(cluster, items, max_items=max_items, token_budget=self.config.prompt_token_budget)
+
+    def summarize_cluster(
+        self,
+        cluster: Cluster,
+        items: list[NewsItem],
+        *,
+        max_items: int = 5,
+        on_token: Callable[[str], None] | None = None,
+    ) -> str:
+        """Generate the cluster summary; with ``config.stream`` each token is passed to ``on_token``."""
+        prompt = self.build_prompt(cluster, items, max_items=max_items)
+        payload = self._generate_payload(prompt=prompt, stream=self.config.stream)
+        if self.config.stream:
+            text, stats = self._generate_stream(payload, on_token)
+        else:
+            text, stats = self._generate(payload)
+        log.info(
+            "Prompt for cluster %s: %s tokens (budget %s)",
+            cluster.cluster_id,
+            stats.get("prompt_eval_count") or f"~{estimate_tokens(prompt)}",
+            self.config.prompt_token_budget,
+        )
+        return text
+
+    def _generate(self, payload: dict[str, object]) -> tuple[str, dict[str, object]]:
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self._base}/api/generate",
                 json=payload,
                 timeout=self.config.timeout_s,
@@ -55,37 +135,113 @@ class OllamaClient:
         data = response.json()
         if "response" not in data:
             raise OllamaError("Malformed Ollama response")
-        return data["response"].strip()
-
-    @staticmethod
-    def _build_prompt(cluster: Cluster, items: list[NewsItem], *, max_items: int) -> str:
-        lines = [
-            "You are drafting a newsroom digest from multiple sources.",
-            "Write output exactly in this format:",
-            "What happened: <single sentence summary>",
-            "- <bullet 1>",
-            "- <bullet 2>",
-            "- <bullet 3>",
-            "(add up to 6 bullets total)",
-            "Sources: name1; name2; ...",
-            "Bullets must highlight key entities, numbers, or dates when present.",
-            "Use only the evidence provided; avoid speculation.",
-            "Stories:",
-        ]
-        for item in items[:max_items]:
-            summary = (item.summary or "")[:400].strip()
-            lines.append(f"- {item.title} (source: {item.source})")
-            if item.summary:
-                lines.append(f"  Summary: {summary}")
-            lines.append(f"  Link: {item.link}")
-        return "\n".join(lines)
-
-
-def build_client(config: OllamaConfig | None) -> OllamaClient | None:
+        return data["response"].strip(), data
+
+    def _generate_stream(
+        self, payload: dict[str, object], on_token: Callable[[str], None] | None
+    ) -> tuple[str, dict[str, object]]:
+        # Ollama streams one JSON object per line; the last one has "done": true.
+        deadline_s = self.config.token_deadline_s
+        read_timeout = min(self.config.timeout_s, deadline_s) if deadline_s else self.config.timeout_s
+        started = time.monotonic()
+        parts: list[str] = []
+        try:
+            with self._http.post(
+                f"{self._base}/api/generate",
+                json=payload,
+                timeout=(self.config.timeout_s, read_timeout),
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(chunk_size=None):
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as exc:
+                        raise OllamaError("Malformed Ollama stream chunk") from exc
+                    if "error" in chunk:
+                        raise OllamaError(f"Ollama generation failed: {chunk['error']}")
+                    token = chunk.get("response", "")
+                    if token:
+                        parts.append(token)
+                        if on_token:
+                            on_token(token)
+                    if chunk.get("done"):
+                        return "".join(parts).strip(), chunk
+                    if deadline_s is not None and time.monotonic() - started > deadline_s:
+                        raise OllamaError(f"Ollama generation exceeded the {deadline_s:g}s deadline")
+        except requests.RequestException as exc:
+            raise OllamaError(f"Ollama request failed: {exc}") from exc
+        raise OllamaError("Ollama stream ended before completion")
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        """One ``/api/embed`` call for a batch of texts, in input order."""
+        payload = self._with_keep_alive({"model": self.config.embed_model, "input": list(texts)})
+        try:
+            response = self._http.post(f"{self._base}/api/embed", json=payload, timeout=self.config.timeout_s)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            raise OllamaError(f"Ollama embed request failed: {exc}") from exc
+        embeddings = data.get("embeddings") if isinstance(data, dict) else None
+        if not isinstance(embeddings, list) or len(embeddings) != len(payload["input"]):
+            raise OllamaError("Malformed Ollama embed response")
+        if not _same_size_vectors(embeddings):
+            raise OllamaError("Ollama returned empty, non-numeric or mixed-size embeddings")
+        return embeddings
+
+
+def build_client(
+    config: OllamaConfig | None,
+    *,
+    session: requests.Session | None = None,
+    status_path: Path | None = None,
+    status_ttl: timedelta | None = None,
+) -> OllamaClient | None:
+    """Client for ``config`` if Ollama answers, else ``None``.
+
+    With ``status_path`` a successful check is remembered for ``status_ttl``,
+    so runs within that window skip the ``/api/tags`` round-trip. Failures are
+    never cached; an Ollama that went away meanwhile only costs the per-cluster
+    fallback.
+    """
     if not config:
         return None
-    client = OllamaClient(config)
+    client = OllamaClient(config, session=session)
+    if status_path and status_ttl and _recently_available(status_path, config, status_ttl):
+        return client
     if client.is_available():
+        if status_path and status_ttl:
+            _record_available(status_path, config)
         return client
     log.info("Ollama not available at %s", config.base_url)
     return None
+
+
+def _recently_available(path: Path, config: OllamaConfig, ttl: timedelta) -> bool:
+    try:
+        status = json.loads(path.read_text())
+        checked_at = datetime.fromisoformat(status["checked_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    if status.get("base_url") != config.base_url or status.get("model") != config.model:
+        return False
+    return utc_now() - checked_at <= ttl
+
+
+def _record_available(path: Path, config: OllamaConfig) -> None:
+    status = {"base_url": config.base_url, "model": config.model, "checked_at": utc_now().isoformat()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(status))
+
+
+def _same_size_vectors(embeddings: list[object]) -> bool:
+    sizes = set()
+    for vector in embeddings:
+        if not isinstance(vector, list) or not vector:
+            return False
+        if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in vector):
+            return False
+        sizes.add(len(vector))
+    return len(sizes) <= 1
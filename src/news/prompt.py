@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import html
+import math
+import re
+from typing import Sequence
+
+from .models import Cluster, NewsItem
+
+# Rough chars-per-token for English text with Llama/Phi style tokenizers.
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 768
+# Only the lede of each summary is used. ClusterStore keeps this many
+# characters per item, so a cluster reloaded on a later run builds the same
+# prompt (and summary cache key) as when its items were fresh.
+SUMMARY_CHARS = 400
+
+INSTRUCTIONS = (
+    "Summarize these news reports in exactly this format:\n"
+    "What happened: <one sentence>\n"
+    "- <2 to 6 bullets with key entities, numbers, dates>\n"
+    "Sources: <source names separated by ;>\n"
+    "Use only the reports; do not speculate.\n"
+    "Reports:"
+)
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+(?=[.,;:!?])")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'“(A-Z0-9])")
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def strip_markup(text: str) -> str:
+    """Plain text of an HTML fragment: tags dropped, entities decoded, whitespace collapsed."""
+    # Tags become spaces so block boundaries do not glue words together.
+    plain = _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text)))
+    return _SPACE_BEFORE_PUNCT_RE.sub("", plain).strip()
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_RE.split(text) if sentence]
+
+
+def build_cluster_prompt(
+    cluster: Cluster,
+    items: Sequence[NewsItem],
+    *,
+    max_items: int = 5,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """Compact summarization prompt for ``items`` that fits ``token_budget`` (estimated).
+
+    Every story keeps its title and source, even when the titles alone go
+    over the budget; summary sentences are then added
+    round-robin (first sentence of each story, then the second, ...) until the
+    budget is spent. Only the first ``SUMMARY_CHARS`` of a summary are used;
+    markup, links and sentences already stated by an earlier title or summary
+    are left out.
+    """
+    stories = list(items[:max_items])
+    seen: set[str] = set()
+    for item in stories:
+        _is_new(strip_markup(item.title), seen)
+    headers = [f"- {strip_markup(item.title)} ({item.source})" for item in stories]
+    used = estimate_tokens(INSTRUCTIONS) + sum(estimate_tokens(header) + 1 for header in headers)
+    pending = [
+        [sentence for sentence in _lede_sentences(item.summary or "") if _is_new(sentence, seen)]
+        for item in stories
+    ]
+    lines = [INSTRUCTIONS]
+    for header, sentences in zip(headers, _fill_round_robin(pending, token_budget - used)):
+        lines.append(header)
+        if sentences:
+            lines.append("  " + " ".join(sentences))
+    return "\n".join(lines)
+
+
+def _lede_sentences(summary: str) -> list[str]:
+    sentences = split_sentences(strip_markup(summary[:SUMMARY_CHARS]))
+    # The cut usually lands mid-sentence; a fragment reads worse than nothing.
+    return sentences[:-1] if len(summary) >= SUMMARY_CHARS else sentences
+
+
+def _fill_round_robin(pending: list[list[str]], budget: int) -> list[list[str]]:
+    kept: list[list[str]] = [[] for _ in pending]
+    # A story stops at its first sentence that does not fit, so each lede stays contiguous.
+    open_stories = set(range(len(pending)))
+    for depth in range(max(map(len, pending), default=0)):
+        for idx, sentences in enumerate(pending):
+            if idx not in open_stories or depth >= len(sentences):
+                continue
+            cost = estimate_tokens(sentences[depth]) + 1
+            if cost > budget:
+                open_stories.discard(idx)
+                continue
+            kept[idx].append(sentences[depth])
+            budget -= cost
+    return kept
+
+
+def _is_new(sentence: str, seen: set[str]) -> bool:
+    key = " ".join(_WORD_RE.findall(sentence.lower()))
+    if not key or key in seen:
+        return False
+    seen.add(key)
+    return True
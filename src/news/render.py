@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime, timezone
 from typing import Sequence
 
@@ -7,6 +8,7 @@ from rich.console import Console
 from rich.table import Table
 
 from .models import Cluster, NewsItem
+from .telemetry import FeedStatsSummary
 
 console = Console(no_color=True)
 MAX_ITEMS_PER_CLUSTER = 5
@@ -40,15 +42,108 @@ def print_clusters(clusters: Sequence[Cluster], *, max_items: int = MAX_ITEMS_PE
         console.rule(f"Cluster {idx}: {cluster.headline()}")
         if cluster.summary:
             console.print(cluster.summary)
-        if cluster.keywords:
-            console.print(f"Keywords: {', '.join(cluster.keywords)}")
-        sources = "; ".join(sorted({item.source for item in cluster.items}))
-        if sources:
-            console.print(f"Sources: {sources}")
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Source")
-        table.add_column("Title")
-        table.add_column("Published")
-        for item in cluster.items[:max_items]:
-            table.add_row(item.source, item.title, format_timestamp(item.published_dt))
-        console.print(table)
+        _print_cluster_details(cluster, max_items=max_items)
+
+
+def _print_cluster_details(cluster: Cluster, *, max_items: int) -> None:
+    if cluster.keywords:
+        console.print(f"Keywords: {', '.join(cluster.keywords)}")
+    sources = "; ".join(sorted({item.source for item in cluster.items}))
+    if sources:
+        console.print(f"Sources: {sources}")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Source")
+    table.add_column("Title")
+    table.add_column("Published")
+    for item in cluster.items[:max_items]:
+        table.add_row(item.source, item.title, format_timestamp(item.published_dt))
+    console.print(table)
+
+
+class LiveClusterPrinter:
+    """Prints clusters in order while their summaries are still being generated.
+
+    Tokens of the cluster currently on screen are printed as they arrive;
+    tokens of later clusters (generated in parallel) are buffered until every
+    earlier cluster is finished. Output matches ``print_clusters`` except that
+    an abandoned stream is followed by the summary that replaced it.
+    """
+
+    def __init__(self, *, max_items: int = MAX_ITEMS_PER_CLUSTER):
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._clusters: list[Cluster] = []
+        self._tokens: dict[int, list[str]] = {}
+        self._finished: dict[int, str] = {}
+        self._current = 0
+
+    def begin(self, clusters: Sequence[Cluster]) -> None:
+        with self._lock:
+            self._clusters = list(clusters)
+            self._tokens.clear()
+            self._finished.clear()
+            self._current = 0
+            if self._clusters:
+                self._open(0)
+
+    def token(self, index: int, text: str) -> None:
+        with self._lock:
+            self._tokens.setdefault(index, []).append(text)
+            if index == self._current:
+                console.print(text, end="", markup=False, highlight=False)
+
+    def finish(self, index: int, summary: str) -> None:
+        with self._lock:
+            self._finished[index] = summary
+            while self._current in self._finished:
+                self._close(self._current)
+                self._current += 1
+                if self._current < len(self._clusters):
+                    self._open(self._current)
+
+    def _open(self, index: int) -> None:
+        console.rule(f"Cluster {index + 1}: {self._clusters[index].headline()}")
+        buffered = "".join(self._tokens.get(index, ()))
+        if buffered:
+            console.print(buffered, end="", markup=False, highlight=False)
+
+    def _close(self, index: int) -> None:
+        streamed = "".join(self._tokens.pop(index, ()))
+        summary = self._finished.pop(index)
+        if streamed:
+            console.print()
+            if streamed.strip() != summary:
+                console.print("(generation stopped early; local summary below)")
+                console.print(summary)
+        elif summary:
+            console.print(summary)
+        _print_cluster_details(self._clusters[index], max_items=self.max_items)
+
+
+def print_feed_stats(summaries: Sequence[FeedStatsSummary]) -> None:
+    if not summaries:
+        console.print("No fetch history recorded yet.")
+        return
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Feed")
+    table.add_column("Runs", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p50 KB", justify="right")
+    table.add_column("p95 KB", justify="right")
+    table.add_column("Parse ms", justify="right")
+    table.add_column("Items", justify="right")
+    for summary in summaries:
+        table.add_row(
+            summary.feed,
+            str(summary.samples),
+            str(summary.errors),
+            f"{summary.p50_latency_s * 1000:.0f}",
+            f"{summary.p95_latency_s * 1000:.0f}",
+            f"{summary.p50_bytes / 1024:.1f}",
+            f"{summary.p95_bytes / 1024:.1f}",
+            f"{summary.p50_parse_s * 1000:.0f}",
+            f"{summary.avg_items:.1f}",
+        )
+    console.print(table)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from .cache import CacheStore
+from .config import FeedConfig
+from .models import utc_now
+
+SPEED_UP = 0.5
+SLOW_DOWN = 1.5
+GAP_SMOOTHING = 0.5
+
+
+class FeedScheduler:
+    """Adaptive per-feed polling plan for ``news watch``.
+
+    Each feed keeps its own interval in the cache feed state: it shrinks when
+    a fetch brings new entries, grows while the feed stays unchanged and backs
+    off exponentially on consecutive failures. Publisher hints (``<ttl>``,
+    ``Cache-Control``/``Expires``) act as floors and ``<skipHours>`` pushes the
+    next poll past the skipped hours.
+    """
+
+    def __init__(
+        self,
+        cache: CacheStore,
+        *,
+        base_interval: timedelta,
+        min_interval: timedelta,
+        max_interval: timedelta,
+    ):
+        self.cache = cache
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+
+    def due_feeds(self, feeds: Sequence[FeedConfig], *, now: datetime | None = None) -> list[FeedConfig]:
+        now = now or utc_now()
+        return [feed for feed in feeds if self.next_due(feed, now=now) <= now]
+
+    def next_due(self, feed: FeedConfig, *, now: datetime | None = None) -> datetime:
+        state = self.cache.feed_state(feed.url)
+        next_due = state.get("next_due")
+        if not next_due:
+            return now or utc_now()
+        return datetime.fromisoformat(next_due)
+
+    def seconds_until_next(self, feeds: Sequence[FeedConfig], *, now: datetime | None = None) -> float:
+        now = now or utc_now()
+        if not feeds:
+            return self.base_interval.total_seconds()
+        earliest = min(self.next_due(feed, now=now) for feed in feeds)
+        return max((earliest - now).total_seconds(), 0.0)
+
+    def record(self, feeds: Sequence[FeedConfig], *, now: datetime | None = None) -> None:
+        """Plan the next poll for feeds that were just fetched."""
+        now = now or utc_now()
+        for feed in feeds:
+            state = self.cache.feed_state(feed.url)
+            interval, update_gap = self._next_interval(state, now)
+            next_due = _skip_hours_after(now + interval, state.get("skip_hours") or ())
+            self.cache.update_feed_state(
+                feed.url,
+                poll_interval_s=interval.total_seconds(),
+                update_gap_s=update_gap,
+                last_change=now.isoformat() if state.get("changed") else state.get("last_change"),
+                next_due=next_due.isoformat(),
+            )
+        self.cache.flush()
+
+    def _next_interval(self, state: dict[str, Any], now: datetime) -> tuple[timedelta, float | None]:
+        previous = timedelta(seconds=state.get("poll_interval_s") or self.base_interval.total_seconds())
+        update_gap = state.get("update_gap_s")
+        failures = state.get("failures", 0)
+        if failures:
+            interval = self.base_interval * (2 ** min(failures, 10))
+            return min(interval, self.max_interval), update_gap
+
+        if state.get("changed"):
+            last_change = state.get("last_change")
+            if last_change:
+                gap = (now - datetime.fromisoformat(last_change)).total_seconds()
+                update_gap = gap if update_gap is None else GAP_SMOOTHING * gap + (1 - GAP_SMOOTHING) * update_gap
+            interval = previous * SPEED_UP
+        else:
+            interval = previous * SLOW_DOWN
+        if update_gap:
+            # Never poll much slower than the feed has been observed to update.
+            interval = min(interval, timedelta(seconds=update_gap))
+
+        floors = [self.min_interval]
+        if state.get("ttl_s"):
+            floors.append(timedelta(seconds=state["ttl_s"]))
+        if state.get("fresh_until"):
+            floors.append(datetime.fromisoformat(state["fresh_until"]) - now)
+        interval = max(interval, *floors)
+        return min(interval, self.max_interval), update_gap
+
+
+def _skip_hours_after(moment: datetime, skip_hours: Sequence[int]) -> datetime:
+    skipped = set(skip_hours)
+    if len(skipped) >= 24:
+        return moment
+    while moment.hour in skipped:
+        moment = (moment + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+    return moment
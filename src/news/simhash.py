@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from collections import Counter, defaultdict
+from typing import Hashable
+
+FINGERPRINT_BITS = 64
+# Bodies shorter than this many words are not fingerprinted; short teasers
+# ("Read more", a one-line summary) would otherwise collide across stories.
+MIN_WORDS = 8
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_BLOCK_TAG_RE = re.compile(r"<\s*/?\s*(?:p|br|div|li|tr|h[1-6])\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+# "Points: 12", "Comments URL: <link>": feed template fields, not story text.
+_FIELD_LINE_RE = re.compile(r"^\W*\w+(?:\s\w+){0,2}\s*:\s*\S*$")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word counts; 0 when the text is too short.
+
+    Markup, links and template field lines are dropped first, and the rest
+    must hold ``MIN_WORDS`` words with letters in them: otherwise every
+    aggregator item sharing a template ("Article URL: ... Points: 12")
+    would fingerprint alike. Single words (rather than shingles) keep the
+    fingerprint stable when a copy only changes a dateline or a couple of
+    words.
+    """
+    words = _WORD_RE.findall(_story_text(text).lower())
+    if sum(not word.isdigit() for word in words) < MIN_WORDS:
+        return 0
+    features = Counter(words)
+    totals = [0] * FINGERPRINT_BITS
+    for feature, weight in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            totals[bit] += weight if value >> bit & 1 else -weight
+    return sum(1 << bit for bit, total in enumerate(totals) if total > 0)
+
+
+def _story_text(text: str) -> str:
+    text = html.unescape(_TAG_RE.sub(" ", _BLOCK_TAG_RE.sub("\n", text)))
+    lines = (_URL_RE.sub("", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if not _FIELD_LINE_RE.match(line))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    """Fingerprints within ``max_distance`` bits of a query, without a full scan.
+
+    The 64 bits are cut into ``max_distance + 1`` blocks; by pigeonhole any
+    fingerprint within the distance matches the query exactly on at least one
+    block. Each block gets its own table (the classic permuted-table scheme
+    with the block rotated to the front), so a lookup only compares the few
+    fingerprints sharing a block value.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < FINGERPRINT_BITS:
+            raise ValueError("max_distance must be between 0 and 63")
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        bounds = [round(idx * FINGERPRINT_BITS / blocks) for idx in range(blocks + 1)]
+        self._blocks = [(low, (1 << (high - low)) - 1) for low, high in zip(bounds, bounds[1:])]
+        self._tables: list[dict[int, list[Hashable]]] = [defaultdict(list) for _ in self._blocks]
+        self._fingerprints: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _block_values(self, fingerprint: int) -> list[int]:
+        return [fingerprint >> shift & mask for shift, mask in self._blocks]
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        self._fingerprints[key] = fingerprint
+        for table, value in zip(self._tables, self._block_values(fingerprint)):
+            table[value].append(key)
+
+    def remove(self, key: Hashable) -> None:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for table, value in zip(self._tables, self._block_values(fingerprint)):
+            bucket = table.get(value)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del table[value]
+
+    def near(self, fingerprint: int) -> list[Hashable]:
+        """Keys whose fingerprint is within ``max_distance`` bits."""
+        found: dict[Hashable, None] = {}
+        for table, value in zip(self._tables, self._block_values(fingerprint)):
+            for key in table.get(value, ()):
+                if key not in found and hamming(fingerprint, self._fingerprints[key]) <= self.max_distance:
+                    found[key] = None
+        return list(found)
+
+    def has_near(self, fingerprint: int) -> bool:
+        for table, value in zip(self._tables, self._block_values(fingerprint)):
+            for key in table.get(value, ()):
+                if hamming(fingerprint, self._fingerprints[key]) <= self.max_distance:
+                    return True
+        return False
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
 from typing import Callable, Sequence
 
 import requests
 
 from .cache import CacheStore
-from .cluster import cluster_items
-from .config import AppConfig
-from .dedupe import dedupe_items
-from .feeds import fetch_all_feeds
-from .filter import apply_filters
+from .cluster import ClusterStore, cluster_items, shard_count
+from .config import AppConfig, FeedConfig, Settings
+from .dedupe import DedupeIndex, dedupe_items, iter_unique
+from .embeddings import EmbeddingCache, cluster_by_embedding
+from .feeds import fetch_all_feeds, iter_all_feeds
+from .filter import apply_filters, iter_filtered
 from .models import Cluster, NewsItem, PipelineOptions
 from .ollama_client import OllamaClient, OllamaError
+from .render import LiveClusterPrinter
+from .summary_cache import SummaryCache, summary_key
+from .telemetry import FetchStatsStore
+from .transport import HttpTransport
 
 log = logging.getLogger(__name__)
 EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
@@ -38,6 +47,13 @@ def run_pipeline(
     session_factory: SessionFactory | None = None,
     llm: OllamaClient | None = None,
     reporter: Callable[[str], None] | None = None,
+    transport: HttpTransport | None = None,
+    feeds: Sequence[FeedConfig] | None = None,
+    telemetry: FetchStatsStore | None = None,
+    dedupe_index: DedupeIndex | None = None,
+    cluster_store: ClusterStore | None = None,
+    summary_cache: SummaryCache | None = None,
+    printer: LiveClusterPrinter | None = None,
 ) -> PipelineResult:
     def report(message: str) -> None:
         if reporter:
@@ -45,59 +61,198 @@ def run_pipeline(
 
     opts = options.clamp()
     settings = app_config.settings
-    report("Fetching feeds")
-    items = fetch_all_feeds(app_config.feeds, settings, session_factory=session_factory)
-    report(f"Fetched {len(items)} raw items")
-    deduped = dedupe_items(items)
-    report(f"Deduped down to {len(deduped)} items")
-    unseen = cache.filter_new_items(deduped, mark=False)
-    report(f"{len(unseen)} unseen items after cache filter")
-    filtered = apply_filters(unseen, opts.filters)
-    report(f"{len(filtered)} items after keyword/tag filters")
-    if opts.max_items is not None:
-        filtered = filtered[: opts.max_items]
-        report(f"Capped to {len(filtered)} items due to --max-items")
+    feed_list = app_config.feeds if feeds is None else feeds
+    session = transport.session if transport else None
+    if opts.stream:
+        report("Streaming feeds through dedupe, cache and filters")
+        fetched = iter_all_feeds(
+            feed_list, settings, session_factory, cache=cache, session=session, telemetry=telemetry
+        )
+        unique = iter_unique(
+            cache.iter_new_items(fetched),
+            engine=settings.dedupe_engine,
+            index=dedupe_index,
+            body_distance=settings.dedupe_body_distance,
+        )
+        # Closing the fetch generator right after the early stop cancels pending
+        # feeds and flushes cache/telemetry before clustering starts.
+        with closing(fetched):
+            filtered = list(islice(iter_filtered(unique, opts.filters), opts.max_items))
+        report(f"{len(filtered)} items streamed through filters")
+    else:
+        report("Fetching feeds")
+        items = fetch_all_feeds(
+            feed_list,
+            settings,
+            session_factory=session_factory,
+            cache=cache,
+            session=session,
+            telemetry=telemetry,
+        )
+        report(f"Fetched {len(items)} raw items")
+        unseen = cache.filter_new_items(items, mark=False)
+        report(f"{len(unseen)} unseen items after cache filter")
+        deduped = dedupe_items(
+            unseen,
+            engine=settings.dedupe_engine,
+            index=dedupe_index,
+            body_distance=settings.dedupe_body_distance,
+        )
+        report(f"Deduped down to {len(deduped)} items")
+        filtered = apply_filters(deduped, opts.filters)
+        report(f"{len(filtered)} items after keyword/tag filters")
+        if opts.max_items is not None:
+            filtered = filtered[: opts.max_items]
+            report(f"Capped to {len(filtered)} items due to --max-items")
     cache.mark_items(filtered)
+    if dedupe_index is not None:
+        dedupe_index.remember(filtered)
 
-    clusters = cluster_items(
-        filtered,
-        similarity_threshold=opts.threshold,
-        max_items=opts.max_items,
-    )
-    report(f"Clustered into {len(clusters)} groups")
+    cluster_engine = opts.cluster_engine or settings.cluster_engine
+    # The TF-IDF and embedding backends are batch-only; they bypass the live store.
+    use_store = cluster_store is not None and cluster_engine not in ("tfidf", "embedding")
+    shards = shard_count(len(filtered), settings.cluster_workers)
+    if use_store and shards > 1:
+        # attach() is serial; a replay big enough to shard clusters in batch instead.
+        use_store = False
+        report(f"Sharding {len(filtered)} items over {shards} workers; live clusters are not updated")
+    clusters: list[Cluster] | None = None
+    if use_store:
+        clusters = cluster_store.attach(filtered, similarity_threshold=opts.threshold)
+        report(f"{len(clusters)} of {len(cluster_store)} live clusters new or updated")
+    elif cluster_engine == "embedding":
+        clusters = _cluster_by_embedding(filtered, llm, cache, settings, opts.max_items, report)
+    if clusters is None:
+        clusters = cluster_items(
+            filtered,
+            similarity_threshold=opts.threshold,
+            max_items=opts.max_items,
+            engine="inverted" if cluster_engine == "embedding" else cluster_engine,
+            workers=settings.cluster_workers,
+        )
+        report(f"Clustered into {len(clusters)} groups")
     llm_client = llm if (llm and opts.llm_enabled) else None
-    llm_used = _summarize_clusters(clusters, llm_client, reporter=reporter)
+    llm_used = _summarize_clusters(
+        clusters,
+        llm_client,
+        reporter=reporter,
+        parallel=settings.ollama.parallelism(),
+        summary_cache=summary_cache,
+        printer=printer,
+    )
+    if llm_client and summary_cache is not None:
+        summary_cache.flush()
+        report(summary_cache.describe())
+    if use_store:
+        cluster_store.record_summaries(clusters)
     cache.mark_clusters(clusters)
+    if transport:
+        report(transport.stats().describe())
     report("Pipeline completed")
     return PipelineResult(clusters=clusters, items=filtered, llm_used=llm_used)
 
 
+def _cluster_by_embedding(
+    items: Sequence[NewsItem],
+    client: OllamaClient | None,
+    cache: CacheStore,
+    settings: Settings,
+    max_items: int | None,
+    report: Callable[[str], None],
+) -> list[Cluster] | None:
+    """Embedding clusters, or ``None`` to fall back to token clustering when Ollama is unavailable."""
+    if client is None:
+        report("Ollama unavailable; falling back to token clustering")
+        return None
+    try:
+        clusters = cluster_by_embedding(
+            items,
+            client,
+            EmbeddingCache(cache.cache_dir, settings.ollama.embed_model),
+            similarity_threshold=settings.embedding_threshold,
+            max_items=max_items,
+            batch_size=settings.ollama.embed_batch_size,
+        )
+    except OllamaError as exc:
+        log.warning("Embedding clustering failed: %s", exc)
+        report(f"Ollama embeddings failed ({exc}); falling back to token clustering")
+        return None
+    report(f"Clustered into {len(clusters)} groups by embedding")
+    return clusters
+
+
 def _summarize_clusters(
     clusters: Sequence[Cluster],
     llm: OllamaClient | None,
     *,
     reporter: Callable[[str], None] | None = None,
+    parallel: int = 1,
+    summary_cache: SummaryCache | None = None,
+    printer: LiveClusterPrinter | None = None,
 ) -> bool:
+    """Fill ``cluster.summary`` for every cluster; returns whether Ollama produced any.
+
+    With ``parallel > 1`` up to that many Ollama generations are in flight at
+    once; summaries are still written back in cluster order. Summaries found
+    in ``summary_cache`` skip Ollama entirely. A ``printer`` renders each
+    cluster as soon as it (and every cluster before it) is summarized.
+    """
+
+    def summarize(index: int) -> tuple[str, bool]:
+        on_token = partial(printer.token, index) if printer else None
+        result = _summarize_cluster(clusters[index], llm, reporter, summary_cache, on_token)
+        if printer:
+            printer.finish(index, result[0])
+        return result
+
+    if printer:
+        printer.begin(clusters)
+    if llm and parallel > 1 and len(clusters) > 1:
+        with ThreadPoolExecutor(max_workers=min(parallel, len(clusters))) as pool:
+            results = list(pool.map(summarize, range(len(clusters))))
+    else:
+        results = [summarize(index) for index in range(len(clusters))]
+    for cluster, (summary_text, _) in zip(clusters, results):
+        cluster.summary = summary_text
+    return any(used for _, used in results)
+
+
+def _summarize_cluster(
+    cluster: Cluster,
+    llm: OllamaClient | None,
+    reporter: Callable[[str], None] | None,
+    summary_cache: SummaryCache | None = None,
+    on_token: Callable[[str], None] | None = None,
+) -> tuple[str, bool]:
+    representative = select_representative_items(cluster)
+    summary_text: str | None = None
     used = False
-    for cluster in clusters:
-        representative = select_representative_items(cluster)
-        summary_text: str | None = None
-        try:
-            if llm:
-                if reporter:
-                    reporter(f"Summarizing cluster {cluster.cluster_id} via Ollama")
-                summary_text = llm.summarize_cluster(cluster, representative)
-                used = True
-        except OllamaError as exc:
-            log.warning("Ollama summarization failed: %s", exc)
+    cache_key = None
+    if llm and summary_cache is not None:
+        prompt = llm.build_prompt(cluster, representative)
+        cache_key = summary_key(llm.config.model, prompt, llm.generation_options())
+        summary_text = summary_cache.get(cache_key)
+        if summary_text:
             if reporter:
-                reporter(f"Ollama failed: {exc}")
-        if not summary_text:
+                reporter(f"Cached summary for cluster {cluster.cluster_id}")
+            return summary_text, True
+    try:
+        if llm:
             if reporter:
-                reporter(f"Using local fallback for cluster {cluster.cluster_id}")
-            summary_text = build_local_summary(cluster, representative)
-        cluster.summary = summary_text
-    return used
+                reporter(f"Summarizing cluster {cluster.cluster_id} via Ollama")
+            summary_text = llm.summarize_cluster(cluster, representative, on_token=on_token)
+            used = True
+            if summary_text and cache_key is not None:
+                summary_cache.put(cache_key, summary_text)
+    except OllamaError as exc:
+        log.warning("Ollama summarization failed: %s", exc)
+        if reporter:
+            reporter(f"Ollama failed: {exc}")
+    if not summary_text:
+        if reporter:
+            reporter(f"Using local fallback for cluster {cluster.cluster_id}")
+        summary_text = build_local_summary(cluster, representative)
+    return summary_text, used
 
 
 def select_representative_items(cluster: Cluster, limit: int = 5) -> list[NewsItem]:
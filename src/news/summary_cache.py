@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Mapping
+
+from .models import utc_now
+
+
+def summary_key(model: str, prompt: str, options: Mapping[str, object]) -> str:
+    """SHA-256 over the model, the exact prompt sent and the generation options.
+
+    Anything that changes what Ollama is asked (items, token budget,
+    instructions, ``num_ctx``/``num_predict``) changes the key.
+    """
+    digest = hashlib.sha256(f"{model}\0{json.dumps(dict(options), sort_keys=True)}\0".encode())
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Generated cluster summaries in ``<cache_dir>/summaries.json``.
+
+    Entries older than ``ttl`` are dropped on load and ignored on lookup; past
+    ``max_entries`` the least recently written entries are evicted. Safe to use
+    from the parallel summarization threads.
+    """
+
+    def __init__(self, cache_dir: Path, *, max_entries: int = 2000, ttl: timedelta | None = None):
+        self.path = cache_dir / "summaries.json"
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: dict[str, dict[str, str]] = self._load()
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return {}
+        entries = {key: entry for key, entry in raw.items() if not self._expired(entry)}
+        self._dirty = len(entries) != len(raw)
+        return entries
+
+    def _expired(self, entry: dict[str, str], now: datetime | None = None) -> bool:
+        if self.ttl is None:
+            return False
+        try:
+            written = datetime.fromisoformat(entry["at"])
+        except (KeyError, ValueError):
+            return True
+        return (now or utc_now()) - written > self.ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["summary"]
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {"summary": summary, "at": utc_now().isoformat()}
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._entries))
+            self._dirty = False
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self) -> str:
+        return f"Summary cache {self.hits}/{self.hits + self.misses} hits ({self.hit_rate:.0%})"
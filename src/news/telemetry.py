@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+from .models import utc_now
+
+DEFAULT_HISTORY = 50
+# Statuses where a response was received; the rest count as errors.
+FETCHED_STATUSES = frozenset({"ok", "not_modified", "unchanged"})
+
+
+@dataclass(slots=True)
+class FetchSample:
+    """Timings and volume for one ``fetch_feed`` call."""
+
+    feed: str
+    url: str
+    at: str = field(default_factory=lambda: utc_now().isoformat())
+    status: str = "ok"
+    connect_s: float | None = None
+    ttfb_s: float | None = None
+    download_s: float | None = None
+    parse_s: float | None = None
+    bytes: int = 0
+    entries: int = 0
+    items: int = 0
+
+    @property
+    def latency_s(self) -> float:
+        return (self.ttfb_s or 0.0) + (self.download_s or 0.0)
+
+
+@dataclass(slots=True)
+class FeedStatsSummary:
+    feed: str
+    url: str
+    samples: int
+    errors: int
+    p50_latency_s: float
+    p95_latency_s: float
+    p50_bytes: int
+    p95_bytes: int
+    p50_parse_s: float
+    avg_items: float
+
+
+class FetchStatsStore:
+    """Rolling per-feed fetch history kept in ``<cache_dir>/feed_stats.json``."""
+
+    def __init__(self, cache_dir: Path, *, history: int = DEFAULT_HISTORY):
+        self.path = cache_dir / "feed_stats.json"
+        self.history = history
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data: dict[str, list[dict[str, object]]] = self._load()
+
+    def _load(self) -> dict[str, list[dict[str, object]]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return {}
+
+    def record(self, sample: FetchSample) -> None:
+        with self._lock:
+            samples = self._data.setdefault(sample.url, [])
+            samples.append(asdict(sample))
+            del samples[: -self.history]
+            self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._data, indent=2))
+            self._dirty = False
+
+    def samples(self, url: str) -> list[FetchSample]:
+        with self._lock:
+            return [FetchSample(**raw) for raw in self._data.get(url, [])]
+
+    def urls_fetched_since(self, since: datetime) -> set[str]:
+        """Feeds with a fetch attempt recorded at or after ``since``."""
+        with self._lock:
+            return {
+                url
+                for url, samples in self._data.items()
+                if samples and datetime.fromisoformat(str(samples[-1]["at"])) >= since
+            }
+
+    def summarize(self) -> list[FeedStatsSummary]:
+        """Per-feed percentiles, slowest (p95 latency) first."""
+        with self._lock:
+            urls = list(self._data)
+        summaries = [_summarize(self.samples(url)) for url in urls]
+        summaries = [summary for summary in summaries if summary is not None]
+        return sorted(summaries, key=lambda summary: summary.p95_latency_s, reverse=True)
+
+
+def _summarize(samples: Sequence[FetchSample]) -> FeedStatsSummary | None:
+    if not samples:
+        return None
+    fetched = [sample for sample in samples if sample.status in FETCHED_STATUSES]
+    latencies = [sample.latency_s for sample in fetched]
+    sizes = [float(sample.bytes) for sample in fetched]
+    parses = [sample.parse_s for sample in fetched if sample.parse_s is not None]
+    last = samples[-1]
+    return FeedStatsSummary(
+        feed=last.feed,
+        url=last.url,
+        samples=len(samples),
+        errors=len(samples) - len(fetched),
+        p50_latency_s=percentile(latencies, 50),
+        p95_latency_s=percentile(latencies, 95),
+        p50_bytes=int(percentile(sizes, 50)),
+        p95_bytes=int(percentile(sizes, 95)),
+        p50_parse_s=percentile(parses, 50),
+        avg_items=sum(sample.items for sample in fetched) / len(fetched) if fetched else 0.0,
+    )
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct * len(ordered) / 100), 1)
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+TOKEN_DELIMS = "\t\n\r .,;:!?()[]{}<>\"'"
+STOPWORDS = {
+    "the",
+    "a",
+    "an",
+    "to",
+    "and",
+    "of",
+    "in",
+    "for",
+    "on",
+}
+
+_DELIM_TABLE = str.maketrans({delim: " " for delim in TOKEN_DELIMS})
+_TITLE_SPLIT = re.compile(r"[^a-zA-Z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased tokens longer than two characters, split on ``TOKEN_DELIMS``."""
+    return [token for token in text.lower().translate(_DELIM_TABLE).split() if len(token) > 2]
+
+
+def token_counts(title: str, summary: str | None, content: str | None) -> Counter[str]:
+    return Counter(tokenize(" \n".join([title, summary or "", content or ""])))
+
+
+def normalize_title(title: str) -> str:
+    """Sorted, de-pluralized title words without stopwords (dedupe key)."""
+    cleaned: list[str] = []
+    for token in _TITLE_SPLIT.split(title.lower()):
+        if not token or token in STOPWORDS:
+            continue
+        if token.endswith("s") and len(token) > 3:
+            token = token[:-1]
+        cleaned.append(token)
+    cleaned.sort()
+    return " ".join(cleaned)
+
+
+class TextFeatures:
+    """Text views of one ``NewsItem``, each computed on first use and then reused.
+
+    Callers must treat the returned values as read-only; ``token_counts`` in
+    particular is shared by every stage that clusters the item.
+    """
+
+    __slots__ = ("_title", "_summary", "_content", "_blob", "_token_counts", "_title_key")
+
+    def __init__(self, title: str, summary: str | None, content: str | None):
+        self._title = title
+        self._summary = summary
+        self._content = content
+        self._blob: str | None = None
+        self._token_counts: Counter[str] | None = None
+        self._title_key: str | None = None
+
+    @property
+    def blob(self) -> str:
+        """Lowercased ``NewsItem.text_blob()`` for keyword matching."""
+        if self._blob is None:
+            parts = [self._title]
+            if self._summary:
+                parts.append(self._summary)
+            if self._content and self._content not in parts:
+                parts.append(self._content)
+            self._blob = "\n".join(parts).strip().lower()
+        return self._blob
+
+    @property
+    def token_counts(self) -> Counter[str]:
+        if self._token_counts is None:
+            self._token_counts = token_counts(self._title, self._summary, self._content)
+        return self._token_counts
+
+    @property
+    def title_key(self) -> str:
+        if self._title_key is None:
+            self._title_key = normalize_title(self._title)
+        return self._title_key
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import zlib
+from collections import Counter
+from typing import Sequence
+
+import numpy as np
+from scipy import sparse
+
+HASH_BITS = 18
+BLOCK_SIZE = 256
+
+
+def tfidf_matrix(vectors: Sequence[Counter[str]], *, hash_bits: int = HASH_BITS) -> sparse.csr_matrix:
+    """L2-normalized TF-IDF rows over tokens hashed (crc32) into ``2**hash_bits`` columns."""
+    n_features = 1 << hash_bits
+    mask = n_features - 1
+    indptr = [0]
+    indices: list[int] = []
+    data: list[float] = []
+    for vector in vectors:
+        buckets: dict[int, float] = {}
+        for token, count in vector.items():
+            bucket = zlib.crc32(token.encode()) & mask
+            buckets[bucket] = buckets.get(bucket, 0.0) + count
+        indices.extend(buckets)
+        data.extend(buckets.values())
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(vectors), n_features),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+    doc_freq = np.bincount(matrix.indices, minlength=n_features)
+    idf = np.log((1.0 + matrix.shape[0]) / (1.0 + doc_freq)) + 1.0
+    matrix.data *= idf[matrix.indices]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+
+def leader_labels(matrix: sparse.csr_matrix, threshold: float, *, block_size: int = BLOCK_SIZE) -> list[int]:
+    """Cluster index per row: the first earlier leader with cosine >= ``threshold``, else a new cluster.
+
+    Rows are processed in blocks; each block is scored against all earlier
+    leaders with one sparse product, and against itself for leaders opened
+    inside the block, which gives the same labels as a row-by-row scan.
+    """
+    rows = matrix.shape[0]
+    if rows == 0:
+        return []
+    if threshold <= 0:
+        # Every similarity (even 0.0) passes, so the first leader takes all.
+        return [0] * rows
+
+    labels: list[int] = []
+    leaders: list[int] = []
+    for start in range(0, rows, block_size):
+        block = matrix[start : start + block_size]
+        earlier = _first_hits(block @ matrix[leaders].T, threshold) if leaders else [None] * block.shape[0]
+        local = (block @ block.T).toarray()
+        block_leaders: list[tuple[int, int]] = []
+        for offset, hit in enumerate(earlier):
+            if hit is None:
+                hit = next((label for j, label in block_leaders if local[offset, j] >= threshold), None)
+            if hit is None:
+                hit = len(leaders)
+                leaders.append(start + offset)
+                block_leaders.append((offset, hit))
+            labels.append(hit)
+    return labels
+
+
+def _first_hits(similarities: sparse.spmatrix, threshold: float) -> list[int | None]:
+    similarities = sparse.csr_matrix(similarities)
+    hits: list[int | None] = []
+    for row in range(similarities.shape[0]):
+        lo, hi = similarities.indptr[row], similarities.indptr[row + 1]
+        passing = similarities.indices[lo:hi][similarities.data[lo:hi] >= threshold]
+        hits.append(int(passing.min()) if passing.size else None)
+    return hits
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Sequence
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .config import FeedConfig, Settings
+
+
+@dataclass(slots=True)
+class TransportStats:
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def describe(self) -> str:
+        return (
+            f"HTTP {self.requests} requests, "
+            f"{self.reused_connections} reused / {self.new_connections} new connections"
+        )
+
+
+_connect_timing = threading.local()
+
+
+def take_connect_time() -> float | None:
+    """Seconds this thread spent in DNS+TCP(+TLS) setup since the last call.
+
+    Only connections opened through an ``HttpTransport`` are timed; ``None``
+    means the last request reused a pooled connection (or was not timed).
+    """
+    elapsed = getattr(_connect_timing, "elapsed", None)
+    _connect_timing.elapsed = None
+    return elapsed
+
+
+def _add_connect_time(elapsed: float) -> None:
+    _connect_timing.elapsed = (getattr(_connect_timing, "elapsed", None) or 0.0) + elapsed
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that remembers which urllib3 pools served requests.
+
+    urllib3 counts connections opened per pool, so reuse is simply the number
+    of requests sent minus the connections the pools had to open.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._stats_lock = threading.Lock()
+        self._pools: dict[int, Any] = {}
+        self._requests = 0
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # type: ignore[override]
+        pool = self.get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        with self._stats_lock:
+            self._pools[id(pool)] = pool
+            self._requests += 1
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+    def stats(self) -> TransportStats:
+        with self._stats_lock:
+            opened = sum(pool.num_connections for pool in self._pools.values())
+            return TransportStats(requests=self._requests, new_connections=opened)
+
+
+class HttpTransport:
+    """Long-lived pooled ``requests.Session`` shared by feeds and Ollama.
+
+    ``pool_maxsize`` bounds the keep-alive connections kept per host and
+    ``pool_connections`` the number of hosts whose pools stay cached.
+    """
+
+    def __init__(self, *, pool_connections: int = 10, pool_maxsize: int = 4):
+        self._adapter = _CountingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+    def stats(self) -> TransportStats:
+        return self._adapter.stats()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def build_transport(settings: Settings, feeds: Sequence[FeedConfig] = ()) -> HttpTransport:
+    hosts = {urlparse(feed.url).netloc for feed in feeds}
+    hosts.add(urlparse(settings.ollama.base_url).netloc)
+    return HttpTransport(
+        pool_connections=max(len(hosts), 1),
+        pool_maxsize=max(settings.fetch_concurrency, settings.ollama.parallelism(), 1),
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
@@ -70,3 +71,78 @@ def test_cache_filters_seen_links(tmp_path, feeds_config):
         return []
 
     # TODO: replace with run_pipeline once we can inject fetch behavior
+
+
+def test_cache_keys_seen_items_on_canonical_link(tmp_path, make_item):
+    cache = CacheStore(tmp_path / "state")
+    cache.mark_items([make_item(link="https://Example.com/story/?utm_source=rss")])
+
+    reloaded = CacheStore(tmp_path / "state")
+    variants = [
+        make_item(id="1", link="https://example.com/story?utm_campaign=mail"),
+        make_item(id="2", link="http://example.com/story/"),
+        make_item(id="3", link="https://example.com/other"),
+    ]
+    assert [item.id for item in reloaded.filter_new_items(variants)] == ["3"]
+
+
+def test_cache_migrates_version_1_seen_links(tmp_path, make_item):
+    cache_dir = tmp_path / "state"
+    cache_dir.mkdir()
+    (cache_dir / "state.json").write_text(
+        json.dumps(
+            {
+                "seen_links": {
+                    "https://example.com/a?utm_source=x": "2024-01-02T00:00:00+00:00",
+                    "https://example.com/a/": "2024-01-01T00:00:00+00:00",
+                    "urn:uuid:1234": "2024-01-03T00:00:00+00:00",
+                },
+                "seen_clusters": {},
+            }
+        )
+    )
+    cache = CacheStore(cache_dir)
+    cache.flush()
+
+    state = json.loads((cache_dir / "state.json").read_text())
+    assert state["version"] == 2
+    assert state["seen_links"] == {
+        "example.com/a": "2024-01-01T00:00:00+00:00",
+        "urn:uuid:1234": "2024-01-03T00:00:00+00:00",
+    }
+    assert cache.filter_new_items([make_item(link="https://example.com/a?utm_medium=feed")]) == []
+
+
+class _FeedResponse:
+    status_code = 200
+    headers: dict[str, str] = {}
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=1):  # noqa: ARG002
+        yield SAMPLE_FEED.encode()
+
+    def close(self):
+        return None
+
+
+class _FeedSession:
+    def get(self, *_args, **_kwargs):
+        return _FeedResponse()
+
+    def close(self):
+        return None
+
+
+def test_unconsumed_items_survive_into_next_process(tmp_path, feeds_config, monkeypatch):
+    def fail_parse(*_args, **_kwargs):
+        raise AssertionError("unchanged body must not be re-parsed")
+
+    options = PipelineOptions(filters=FilterOptions(max_items=1), max_items=1, llm_enabled=False)
+    first = run_pipeline(feeds_config, CacheStore(tmp_path / "state"), options, session_factory=_FeedSession)
+    assert [item.title for item in first.items] == ["Story One"]
+
+    monkeypatch.setattr("news.feeds.feedparser.parse", fail_parse)
+    second = run_pipeline(feeds_config, CacheStore(tmp_path / "state"), options, session_factory=_FeedSession)
+    assert [item.title for item in second.items] == ["Story Two"]
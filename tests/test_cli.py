@@ -5,8 +5,11 @@ from pathlib import Path
 from typer.testing import CliRunner
 
 from news import cli
+from news.cache import CacheStore
+from news.config import AppConfig, Settings
 from news.models import Cluster, NewsItem
 from news.summarize import PipelineResult
+from news.telemetry import FetchSample, FetchStatsStore
 
 runner = CliRunner()
 
@@ -51,7 +54,7 @@ def test_cli_fetch_reports_items(tmp_path, monkeypatch):
     items = [_news_item("Story", "https://example.com/a"), _news_item("Story2", "https://example.com/b")]
 
     monkeypatch.setattr(cli, "fetch_all_feeds", lambda *args, **kwargs: items)
-    monkeypatch.setattr(cli, "dedupe_items", lambda data: data)
+    monkeypatch.setattr(cli, "dedupe_items", lambda data, **_kwargs: data)
     monkeypatch.setattr(cli, "apply_filters", lambda data, opts: data)
     monkeypatch.setattr(cli, "CacheStore", DummyCache)
     monkeypatch.setattr(cli, "print_fetch_summary", lambda data, top_n: print(f"{len(data)} shown"))
@@ -66,7 +69,7 @@ def test_cli_fetch_since_option(tmp_path, monkeypatch):
     items = [_news_item("Story", "https://example.com/a")]
 
     monkeypatch.setattr(cli, "fetch_all_feeds", lambda *args, **kwargs: items)
-    monkeypatch.setattr(cli, "dedupe_items", lambda data: data)
+    monkeypatch.setattr(cli, "dedupe_items", lambda data, **_kwargs: data)
 
     captured: dict[str, object] = {}
 
@@ -162,6 +165,70 @@ def test_cli_summarize_debug_enables_reporter(tmp_path, monkeypatch):
     assert callable(captured.get("reporter"))
 
 
+def test_cli_cluster_engine_is_a_validated_choice(tmp_path, monkeypatch):
+    config_path = _write_config(tmp_path)
+    captured: dict[str, object] = {}
+
+    def fake_run_pipeline(_config, _cache, opts, **_kwargs):
+        captured["engine"] = opts.cluster_engine
+        return PipelineResult(clusters=[], items=[], llm_used=False)
+
+    monkeypatch.setattr(cli, "run_pipeline", fake_run_pipeline)
+    monkeypatch.setattr(cli, "print_clusters", lambda clusters: None)
+
+    args = ["summarize", "--config", str(config_path), "--no-llm", "--cluster-engine"]
+    assert runner.invoke(cli.app, [*args, "linear"]).exit_code == 0
+    assert captured["engine"] == "linear" and type(captured["engine"]) is str
+    captured.clear()
+    assert runner.invoke(cli.app, [*args, "bogus"]).exit_code == 2
+    assert captured == {}
+
+
+def test_no_llm_still_builds_the_client_for_embedding_clustering(monkeypatch):
+    config = AppConfig(settings=Settings(), feeds=[])
+    monkeypatch.setattr(cli, "build_client", lambda ollama_config, **_kwargs: ollama_config)
+
+    assert cli._maybe_build_ollama(config, False) is None
+    assert cli._maybe_build_ollama(config, False, cluster_engine="embedding") is not None
+    config.settings.cluster_engine = "embedding"
+    assert cli._maybe_build_ollama(config, False) is not None
+
+
+def test_watch_schedules_only_feeds_fetched_this_iteration(tmp_path, monkeypatch):
+    config_path = tmp_path / "feeds.yaml"
+    config_path.write_text(
+        """
+settings:
+  cache_dir: .cache
+  ollama:
+    enabled: false
+feeds:
+  - name: Fetched
+    url: https://example.com/a
+  - name: Cancelled
+    url: https://example.com/b
+"""
+    )
+
+    def fake_run_pipeline(*_args, telemetry, **_kwargs):
+        # Streaming with --max-items stopped before the second feed was fetched.
+        telemetry.record(FetchSample(feed="Fetched", url="https://example.com/a"))
+        return PipelineResult(clusters=[], items=[], llm_used=False)
+
+    def stop(_seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "run_pipeline", fake_run_pipeline)
+    monkeypatch.setattr(cli, "print_clusters", lambda clusters: None)
+    monkeypatch.setattr(cli.time, "sleep", stop)
+
+    result = runner.invoke(cli.app, ["watch", "--config", str(config_path), "--no-llm"])
+    assert result.exit_code == 0
+    cache = CacheStore(tmp_path / ".cache")
+    assert cache.feed_state("https://example.com/a").get("next_due")
+    assert not cache.feed_state("https://example.com/b").get("next_due")
+
+
 def test_print_run_stats(monkeypatch, capsys):
     monkeypatch.setattr(cli, "_current_memory_mb", lambda: 123.4)
     cli._print_run_stats(2.5, prefix="[test]")
@@ -169,3 +236,16 @@ def test_print_run_stats(monkeypatch, capsys):
     assert "[test]" in output
     assert "2.50s" in output
     assert "123.4" in output
+
+
+def test_cli_feed_stats_prints_table(tmp_path, monkeypatch):
+    config_path = _write_config(tmp_path)
+    store = FetchStatsStore(tmp_path / ".cache")
+    store.record(FetchSample(feed="Example", url="https://example.com/rss", ttfb_s=0.25, bytes=2048, items=4))
+    store.flush()
+    printed: list[list[str]] = []
+    monkeypatch.setattr(cli, "print_feed_stats", lambda summaries: printed.append([s.feed for s in summaries]))
+
+    result = runner.invoke(cli.app, ["feed-stats", "--config", str(config_path)])
+    assert result.exit_code == 0
+    assert printed == [["Example"]]
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from news.cluster import cluster_items
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import news
+from news.cluster import ClusterError, ClusterStore, cluster_items
 
 
 def test_cluster_groups_similar_items(make_item):
@@ -13,3 +20,120 @@ def test_cluster_groups_similar_items(make_item):
     assert len(clusters) == 2
     assert len(clusters[0].items) == 2
     assert clusters[0].keywords
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.2, 0.55, 0.9])
+def test_inverted_engine_matches_linear_engine(make_item, threshold):
+    rng = random.Random(3)
+    vocab = [f"word{idx}" for idx in range(40)]
+    items = [
+        make_item(
+            id=str(idx),
+            title=" ".join(rng.choices(vocab, k=4)),
+            summary=" ".join(rng.choices(vocab, k=8)) if idx % 7 else "",
+            published_dt=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=idx),
+        )
+        for idx in range(120)
+    ]
+    items.append(make_item(id="empty", title="a", summary=""))
+
+    def shape(clusters):
+        return [(c.cluster_id, [item.id for item in c.items], c.keywords, c.score) for c in clusters]
+
+    inverted = cluster_items(items, similarity_threshold=threshold)
+    linear = cluster_items(items, similarity_threshold=threshold, engine="linear")
+    assert shape(inverted) == shape(linear)
+
+
+def test_tfidf_engine_reports_missing_numpy(make_item, monkeypatch):
+    monkeypatch.setitem(sys.modules, "news.tfidf", None)
+    monkeypatch.delattr(news, "tfidf", raising=False)
+    with pytest.raises(ClusterError, match="numpy and scipy"):
+        cluster_items([make_item()], engine="tfidf")
+
+
+def test_unknown_engine_raises(make_item):
+    with pytest.raises(ClusterError, match="Unknown cluster engine 'kmeans'"):
+        cluster_items([make_item()], engine="kmeans")
+
+
+def test_cluster_store_attaches_follow_ups_and_ages_out(tmp_path, make_item):
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    store = ClusterStore(tmp_path, window=timedelta(hours=48))
+    first = store.attach(
+        [
+            make_item(id="1", title="Nvidia unveils new AI chip", summary="Nvidia chip launch", link="https://a/1"),
+            make_item(id="2", title="Global economy outlook", summary="IMF update", link="https://a/2"),
+        ],
+        similarity_threshold=0.3,
+        now=day,
+    )
+    assert len(first) == 2
+    chip_id = first[0].cluster_id
+    first[0].summary = "chip summary"
+    store.record_summaries(first)
+
+    reloaded = ClusterStore(tmp_path, window=timedelta(hours=48))
+    follow_up = make_item(
+        id="3",
+        title="Nvidia AI chip ships",
+        summary="Nvidia chip launch update",
+        link="https://b/3",
+        published_dt=day + timedelta(hours=29),
+    )
+    changed = reloaded.attach([follow_up], similarity_threshold=0.3, now=day + timedelta(hours=30))
+    assert [cluster.cluster_id for cluster in changed] == [chip_id]
+    # Newest first for rendering and the summary prompt; the id still comes from the first story.
+    assert [item.id for item in changed[0].items] == ["3", "1"]
+    assert changed[0].score == 2.0
+    assert changed[0].summary == "chip summary"
+
+    # The economy cluster saw no update for 48h; the chip cluster did 30h in.
+    reloaded.attach([], now=day + timedelta(hours=60))
+    assert len(reloaded) == 1
+
+
+def test_cluster_store_keeps_the_newest_items_of_a_large_batch(tmp_path, make_item):
+    day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = [
+        make_item(
+            id=str(idx),
+            title="Nvidia unveils new AI chip",
+            summary="Nvidia chip launch",
+            link=f"https://a/{idx}",
+            published_dt=day + timedelta(minutes=idx),
+        )
+        for idx in range(30)
+    ]
+    store = ClusterStore(tmp_path, window=timedelta(hours=48))
+    (cluster,) = store.attach(items, similarity_threshold=0.3, now=day + timedelta(hours=1))
+    assert [item.id for item in cluster.items] == [str(idx) for idx in range(29, 9, -1)]
+    assert cluster.score == 30.0
+
+
+def test_sharded_clustering_merges_clusters_across_time_buckets(make_item, monkeypatch):
+    monkeypatch.setattr("news.cluster.MIN_SHARD_ITEMS", 10)
+    topics = [
+        "nvidia chip launch datacenter gpu",
+        "storm coast flooding evacuation rain",
+        "central bank interest rates inflation",
+    ]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = [
+        make_item(
+            id=str(idx),
+            title=topics[idx % 3],
+            summary=f"{topics[idx % 3]} update{idx}",
+            published_dt=start + timedelta(hours=idx),
+        )
+        for idx in range(60)
+    ]
+
+    def partition(clusters):
+        return sorted(sorted(item.id for item in cluster.items) for cluster in clusters)
+
+    serial = cluster_items(items, similarity_threshold=0.5)
+    sharded = cluster_items(items, similarity_threshold=0.5, workers=3)
+    assert len(sharded) == 3
+    assert partition(sharded) == partition(serial)
+    assert [cluster.cluster_id for cluster in sharded] == ["cluster-1", "cluster-2", "cluster-3"]
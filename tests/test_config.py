@@ -25,6 +25,13 @@ feeds:
     assert result.config.feeds[0].name == "Test Feed"
 
 
+@pytest.mark.parametrize(("raw", "expected"), [("-1", -1), ("300", 300), ("30m", "30m"), ("null", None)])
+def test_keep_alive_accepts_seconds_and_durations(tmp_path, raw, expected):
+    cfg = tmp_path / "feeds.yaml"
+    cfg.write_text(f"settings:\n  ollama:\n    keep_alive: {raw}\nfeeds: []\n")
+    assert load_config(cfg).config.settings.ollama.keep_alive == expected
+
+
 def test_parse_since_window_and_duration():
     now = datetime(2024, 1, 2, tzinfo=timezone.utc)
     since = parse_since_window("24h", now=now)
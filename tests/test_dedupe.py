@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from news.dedupe import dedupe_items
+from datetime import timedelta
+
+from news.dedupe import DedupeIndex, dedupe_items
+from news.models import utc_now
 
 
 def test_dedupe_same_link(make_item):
@@ -29,3 +32,109 @@ def test_dedupe_strips_tracking_params(make_item):
     ]
     unique = dedupe_items(items)
     assert [item.id for item in unique] == ["1", "3"]
+
+
+def test_lsh_engine_matches_exact_engine(make_item):
+    titles = [
+        "Nvidia unveils new AI chip for data centers",
+        "Nvidia unveils new AI chips for data centers",
+        "New AI chip for data centers unveiled by Nvidia",
+        "The storm hits the coast overnight",
+        "Storm hits coast overnight",
+        "Central bank holds interest rates steady",
+        "Central bank holds interest rate steady",
+        "Local team wins championship final",
+        "The",
+        "A",
+    ]
+    items = [make_item(id=str(idx), title=title, link=f"https://example.com/{idx}") for idx, title in enumerate(titles)]
+    lsh = [item.id for item in dedupe_items(items)]
+    exact = [item.id for item in dedupe_items(items, engine="exact")]
+    assert lsh == exact
+    assert len(lsh) < len(titles)
+
+
+def test_dedupe_index_catches_republished_story_across_runs(tmp_path, make_item):
+    first_run = [make_item(id="1", title="MIT team builds faster battery", link="https://example.com/battery")]
+    index = DedupeIndex(tmp_path)
+    assert dedupe_items(first_run, index=index) == first_run
+    index.remember(first_run)
+
+    reloaded = DedupeIndex(tmp_path)
+    second_run = [
+        make_item(id="2", title="MIT team builds faster batteries", link="https://example.com/2024/battery-v2"),
+        make_item(id="3", title="Other story", link="https://example.com/battery/?utm_source=rss"),
+        make_item(id="4", title="Unrelated weather report", link="https://example.com/weather"),
+    ]
+    assert [item.id for item in dedupe_items(second_run, index=reloaded)] == ["4"]
+
+
+def test_dedupe_index_is_size_bounded(tmp_path, make_item):
+    index = DedupeIndex(tmp_path, max_entries=2)
+    index.remember(
+        [
+            make_item(id=str(idx), title=title, link=f"https://example.com/{idx}")
+            for idx, title in enumerate(["Alpha launch", "Budget vote", "Comet sighting"])
+        ]
+    )
+    reloaded = DedupeIndex(tmp_path, max_entries=2)
+    assert len(reloaded) == 2
+    assert not reloaded.has_link("example.com/0")
+    assert not reloaded.has_similar_title("alpha launch", 0.92)
+    assert reloaded.has_similar_title("comet sighting", 0.92)
+
+
+def test_dedupe_index_ages_out_recurring_headlines(tmp_path, make_item):
+    now = utc_now()
+    index = DedupeIndex(tmp_path)
+    briefing = make_item(id="1", title="Daily briefing", link="https://example.com/b/1")
+    index.remember([briefing], now=now - timedelta(days=3))
+    index.remember([make_item(id="2", title="Budget vote", link="https://example.com/v")], now=now)
+
+    assert DedupeIndex(tmp_path).has_similar_title("briefing daily", 0.92)
+    reloaded = DedupeIndex(tmp_path, window=timedelta(days=2))
+    assert not reloaded.has_similar_title("briefing daily", 0.92)
+    assert not reloaded.has_link("example.com/b/1")
+    assert reloaded.has_link("example.com/v")
+
+
+def test_dedupe_drops_syndicated_copy_with_rewritten_headline(tmp_path, make_item):
+    body = (
+        "The Senate on Tuesday passed a sweeping bill to fund the government through September, "
+        "averting a shutdown hours before the midnight deadline. The measure now heads to the president, "
+        "who is expected to sign it later this week after months of negotiations."
+    )
+    items = [
+        make_item(id="1", title="Senate passes funding bill", link="https://apnews.com/a", summary=f"(AP) {body}"),
+        make_item(
+            id="2",
+            title="Shutdown averted as lawmakers act",
+            link="https://reuters.com/b",
+            summary=f"(Reuters) {body}",
+        ),
+        make_item(id="3", title="Short teaser", link="https://example.com/c", summary="Read more"),
+        make_item(id="4", title="Another teaser", link="https://example.com/d", summary="Read more"),
+    ]
+    assert [item.id for item in dedupe_items(items)] == ["1", "3", "4"]
+    assert [item.id for item in dedupe_items(items, body_distance=None)] == ["1", "2", "3", "4"]
+
+    index = DedupeIndex(tmp_path)
+    index.remember(items[:1])
+    assert [item.id for item in dedupe_items(items[1:2], index=DedupeIndex(tmp_path))] == []
+
+
+def test_templated_aggregator_summaries_are_not_body_duplicates(make_item):
+    topics = "compiler database kernel browser startup robotics climate typeface chess satellite".split()
+    items = []
+    for idx in range(30):
+        summary = (
+            f'<p>Article URL: <a href="https://site{idx}.com/post">https://site{idx}.com/post</a></p>\n'
+            f'<p>Comments URL: <a href="https://news.ycombinator.com/item?id={4000 + idx}">'
+            f"https://news.ycombinator.com/item?id={4000 + idx}</a></p>\n"
+            f"<p>Points: {idx * 7 % 50}</p>\n<p># Comments: {idx % 9}</p>"
+        )
+        title = f"Show HN: {topics[idx % 10]} project number {idx} {'alpha beta gamma'.split()[idx // 10]}"
+        items.append(make_item(id=str(idx), title=title, link=f"https://site{idx}.com/post", summary=summary))
+
+    assert all(item.body_fingerprint() == 0 for item in items)
+    assert len(dedupe_items(items)) == 30
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import threading
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from news.cache import CacheStore
+from news.config import AppConfig, Settings
+from news.embeddings import EmbeddingCache, cluster_by_embedding, nearest_centroid_labels
+from news.models import FilterOptions, PipelineOptions
+from news.ollama_client import OllamaClient, OllamaConfig, OllamaError
+from news.summarize import run_pipeline
+
+# Paraphrases share no title words but map to the same embedding axis.
+TOPICS = {"chip": [1.0, 0.1, 0.0], "semiconductor": [0.9, 0.2, 0.0], "storm": [0.0, 0.1, 1.0]}
+
+
+class _EmbedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    batches: list[int] = []
+
+    def do_POST(self):  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).batches.append(len(payload["input"]))
+        embeddings = [
+            next((vector for word, vector in TOPICS.items() if word in text.lower()), [0.0, 1.0, 0.0])
+            for text in payload["input"]
+        ]
+        body = json.dumps({"model": payload["model"], "embeddings": embeddings}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        return None
+
+
+@pytest.fixture
+def embed_server():
+    _EmbedHandler.batches = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmbedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _items(make_item):
+    return [
+        make_item(id="1", title="Nvidia chip unveiled", summary="New accelerator", link="https://a/1"),
+        make_item(id="2", title="Semiconductor giant shows accelerator", summary="Launch event", link="https://a/2"),
+        make_item(id="3", title="Storm batters coast", summary="Flooding", link="https://a/3"),
+    ]
+
+
+def test_embedding_clusters_paraphrases_and_caches_vectors(tmp_path, embed_server, make_item):
+    client = OllamaClient(OllamaConfig(base_url=embed_server, model="phi3", timeout_s=5))
+    clusters = cluster_by_embedding(_items(make_item), client, EmbeddingCache(tmp_path, "m"), batch_size=2)
+    assert [[item.id for item in cluster.items] for cluster in clusters] == [["1", "2"], ["3"]]
+    assert clusters[0].keywords
+    assert _EmbedHandler.batches == [2, 1]
+
+    reloaded = EmbeddingCache(tmp_path, "m")
+    assert len(reloaded) == 3
+    cluster_by_embedding(_items(make_item), client, reloaded)
+    assert _EmbedHandler.batches == [2, 1]
+    assert len(EmbeddingCache(tmp_path, "other-model")) == 0
+
+
+def test_embedding_run_larger_than_the_cache(tmp_path, embed_server, make_item):
+    client = OllamaClient(OllamaConfig(base_url=embed_server, model="phi3", timeout_s=5))
+    items = [
+        make_item(id=str(idx), title=f"Storm {idx} batters coast", summary="Flooding", link=f"https://a/{idx}")
+        for idx in range(10)
+    ]
+    cache = EmbeddingCache(tmp_path, "m", max_entries=5)
+    clusters = cluster_by_embedding(items, client, cache, batch_size=4)
+    assert [len(cluster.items) for cluster in clusters] == [10]
+    assert len(EmbeddingCache(tmp_path, "m")) == 5
+
+
+def test_nearest_centroid_search_without_numpy(monkeypatch):
+    vectors = [array("f", vector) for vector in ([1, 0], [0.8, 0.6], [0, 1], [0.6, 0.8])]
+    with_numpy = nearest_centroid_labels(vectors, 0.75)
+    monkeypatch.setattr("news.embeddings.np", None)
+    assert nearest_centroid_labels(vectors, 0.75) == with_numpy == [0, 0, 1, 0]
+
+
+def test_pipeline_falls_back_to_token_clustering_when_ollama_is_down(tmp_path, make_item, monkeypatch):
+    config = AppConfig(settings=Settings(cluster_engine="embedding", cluster_window=None), feeds=[])
+    client = OllamaClient(OllamaConfig(base_url="http://127.0.0.1:9", model="phi3", timeout_s=1))
+    monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, **kwargs: _items(make_item))
+    messages: list[str] = []
+    result = run_pipeline(
+        config,
+        CacheStore(tmp_path),
+        PipelineOptions(filters=FilterOptions(), llm_enabled=False),
+        llm=client,
+        reporter=messages.append,
+    )
+    assert len(result.clusters) == 3
+    assert any("falling back to token clustering" in message for message in messages)
+
+
+class _CannedResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        if isinstance(self._payload, Exception):
+            raise self._payload
+        return self._payload
+
+
+class _CannedSession:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def post(self, url, json, timeout):  # noqa: ARG002
+        return _CannedResponse(self.payload)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        ValueError("not json"),
+        ["not", "an", "object"],
+        {"embeddings": [[0.1, 0.2]]},
+        {"embeddings": [[0.1, 0.2], []]},
+        {"embeddings": [[0.1, 0.2], [0.3]]},
+        {"embeddings": [[0.1, 0.2], ["a", "b"]]},
+    ],
+)
+def test_embed_rejects_malformed_responses(payload):
+    client = OllamaClient(OllamaConfig(base_url="http://x", model="phi3", timeout_s=1), session=_CannedSession(payload))
+    with pytest.raises(OllamaError):
+        client.embed(["first", "second"])
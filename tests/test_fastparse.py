@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import feedparser
+import pytest
+
+from news.config import FeedConfig, Settings
+from news.fastparse import FastParseError, parse_feed
+from news.feeds import _entry_to_news_item, fetch_feed
+
+FEED = FeedConfig(name="Parity", url="https://example.com/rss", tags=["tech"])
+
+RSS_FEED = b"""<?xml version='1.0' encoding='UTF-8'?>
+<rss version='2.0' xmlns:dc='http://purl.org/dc/elements/1.1/' xmlns:content='http://purl.org/rss/1.0/modules/content/'>
+  <channel>
+    <title>Example</title>
+    <ttl>30</ttl>
+    <item>
+      <title> Story One </title>
+      <link>https://example.com/one?a=1&amp;b=2</link>
+      <guid isPermaLink='false'>id-1</guid>
+      <description>Summary 1</description>
+      <pubDate>Mon, 01 Jan 2024 10:00:00 +0200</pubDate>
+      <category>AI</category>
+      <category>Chips</category>
+      <dc:creator>Jane Doe</dc:creator>
+    </item>
+    <item>
+      <title>Story Two</title>
+      <guid>https://example.com/two</guid>
+      <content:encoded>Body two</content:encoded>
+      <pubDate>Tue, 02 Jan 2024 08:30:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Story Three &amp; more</title>
+      <link>https://example.com/three</link>
+      <description>Fish &amp; chips &#8220;cost&#8221; &lt; 5</description>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM_FEED = b"""<?xml version='1.0' encoding='utf-8'?>
+<feed xmlns='http://www.w3.org/2005/Atom'>
+  <title>Atom Example</title>
+  <id>urn:feed</id>
+  <updated>2024-01-03T00:00:00Z</updated>
+  <entry>
+    <title>Atom one</title>
+    <link rel='self' href='https://example.com/self'/>
+    <link rel='alternate' href='https://example.com/a1'/>
+    <id>urn:a1</id>
+    <published>2024-01-01T03:04:05+01:00</published>
+    <updated>2024-01-02T03:04:05Z</updated>
+    <summary>Short summary</summary>
+    <category term='Science'/>
+    <author><name>Ann</name></author>
+  </entry>
+  <entry>
+    <title type='text'>Atom two</title>
+    <link href='https://example.com/a2'/>
+    <id>urn:a2</id>
+    <updated>2024-01-03T00:00:00Z</updated>
+    <content type='text'>Full text</content>
+  </entry>
+</feed>
+"""
+
+
+def _items(entries):
+    return [_entry_to_news_item(FEED, entry) for entry in entries]
+
+
+@pytest.mark.parametrize("body", [RSS_FEED, ATOM_FEED], ids=["rss2", "atom"])
+@pytest.mark.parametrize("limit", [1, 10])
+def test_fast_parser_matches_feedparser(body, limit):
+    expected = _items(feedparser.parse(body).entries[:limit])
+    actual = _items(parse_feed(body, limit=limit).entries)
+    assert actual == expected
+
+
+def test_fast_parser_reads_channel_ttl():
+    assert parse_feed(RSS_FEED, limit=10).feed["ttl"] == feedparser.parse(RSS_FEED).feed["ttl"]
+
+
+def test_fast_parser_stops_after_limit_without_reading_rest():
+    truncated = RSS_FEED[: RSS_FEED.index(b"<title>Story Two")]
+    assert len(parse_feed(truncated, limit=1).entries) == 1
+    with pytest.raises(FastParseError):
+        parse_feed(truncated, limit=2)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"<rss version='2.0'><channel><item><title>Broken</item></channel></rss>",
+        b"<rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#'></rdf:RDF>",
+        b"<rss version='2.0'><channel><item><title>X</title><author>a@b.c (A)</author></item></channel></rss>",
+    ],
+    ids=["malformed", "rss1", "rss-author"],
+)
+def test_fast_parser_rejects_input_feedparser_must_handle(body):
+    with pytest.raises(FastParseError):
+        parse_feed(body, limit=10)
+
+
+def test_fast_parser_keeps_escaped_html_as_decoded_text():
+    body = (
+        b"<rss version='2.0'><channel><item><title>AT&amp;T rises</title>"
+        b"<description>&lt;p&gt;Shares of AT&amp;amp;T &lt;b&gt;rose&lt;/b&gt; &#8217;24&lt;/p&gt;</description>"
+        b"<category>Tech &amp; Media</category></item></channel></rss>"
+    )
+    entry = parse_feed(body, limit=10).entries[0]
+    assert entry["title"] == "AT&T rises"
+    assert entry["summary"] == "<p>Shares of AT&T <b>rose</b> \u201924</p>"
+    assert entry["tags"] == [{"term": "Tech & Media"}]
+
+
+def test_fetch_feed_falls_back_to_feedparser_on_bozo_input():
+    body = "<rss version='2.0'><channel><item><title>Loose</title><link>https://example.com/l</link></item>"
+
+    class Response:
+        content = body.encode()
+        status_code = 200
+        headers: dict[str, str] = {}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size=1):  # noqa: ARG002
+            yield self.content
+
+        def close(self):
+            return None
+
+    class Session:
+        def get(self, *_args, **_kwargs):
+            return Response()
+
+        def close(self):
+            return None
+
+    items = fetch_feed(FEED, Settings(fast_parser=True), session=Session())
+    assert [item.title for item in items] == ["Loose"]
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
+import time
+
 import pytest
 import requests
 
+from news.cache import CacheStore
 from news.config import FeedConfig, Settings
-from news.feeds import FeedError, fetch_feed
+from news.feeds import FeedError, FeedTooLargeError, fetch_all_feeds, fetch_feed
 
 SAMPLE_FEED = """<?xml version='1.0' encoding='UTF-8'?>
 <rss version='2.0'>
@@ -28,8 +32,17 @@ SAMPLE_FEED = """<?xml version='1.0' encoding='UTF-8'?>
 
 
 class DummyResponse:
-    def __init__(self, content: str):
+    def __init__(self, content: str, status_code: int = 200, headers: dict[str, str] | None = None):
         self.content = content.encode()
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        return None
 
     def raise_for_status(self) -> None:
         return None
@@ -79,3 +92,225 @@ def test_fetch_feed_raises_feed_error_on_http_failure():
     settings = Settings()
     with pytest.raises(FeedError):
         fetch_feed(feed, settings, session=ErrorSession(SAMPLE_FEED))
+
+
+class UrlSession(DummySession):
+    """Serves a feed per URL; slow URLs sleep and ``/down`` always fails."""
+
+    def __init__(self, delays: dict[str, float]):
+        super().__init__(SAMPLE_FEED)
+        self.delays = delays
+
+    def get(self, url, *_args, **_kwargs):
+        time.sleep(self.delays.get(url, 0))
+        if url.endswith("/down"):
+            raise requests.RequestException("down")
+        name = url.rsplit("/", 1)[-1]
+        return DummyResponse(SAMPLE_FEED.replace("https://example.com/", f"https://{name}.example.com/"))
+
+
+def test_fetch_all_feeds_concurrent_keeps_feed_order():
+    feeds = [
+        FeedConfig(name="Slow", url="https://feeds.test/slow"),
+        FeedConfig(name="Down", url="https://feeds.test/down"),
+        FeedConfig(name="Fast", url="https://feeds.test/fast"),
+    ]
+    settings = Settings(fetch_concurrency=3, retry_backoff_s=0)
+    delays = {"https://feeds.test/slow": 0.05}
+    items = fetch_all_feeds(feeds, settings, session_factory=lambda: UrlSession(delays))
+    assert [item.source for item in items] == ["Slow", "Slow", "Fast", "Fast"]
+    assert items[0].link == "https://slow.example.com/one"
+
+
+class ConditionalSession(DummySession):
+    """Answers 304 when the client echoes the ETag it was given."""
+
+    def __init__(self):
+        super().__init__(SAMPLE_FEED)
+        self.sent_headers: list[dict[str, str]] = []
+
+    def get(self, *_args, headers=None, **_kwargs):
+        headers = headers or {}
+        self.sent_headers.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return DummyResponse("", status_code=304)
+        return DummyResponse(SAMPLE_FEED, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_fetch_feed_conditional_get_skips_unchanged(tmp_path, monkeypatch):
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    settings = Settings()
+    session = ConditionalSession()
+    cache = CacheStore(tmp_path)
+    first = fetch_feed(feed, settings, session=session, cache=cache)
+    assert len(first) == 2
+    cache.flush()
+
+    cache = CacheStore(tmp_path)
+    assert cache.feed_state(feed.url)["etag"] == '"v1"'
+
+    def fail_parse(*_args, **_kwargs):
+        raise AssertionError("feedparser should not run on 304")
+
+    monkeypatch.setattr("news.feeds.feedparser.parse", fail_parse)
+    # A new process still gets the items of the unchanged feed back on a 304.
+    second = fetch_feed(feed, settings, session=session, cache=cache)
+    assert second == first
+    assert session.sent_headers[-1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_fetch_feed_revalidates_only_with_stored_items(tmp_path):
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    session = ConditionalSession()
+    cache = CacheStore(tmp_path)
+    first = fetch_feed(feed, Settings(), session=session, cache=cache)
+    cache.flush()
+    (tmp_path / "parsed_items.json").unlink()
+
+    again = fetch_feed(feed, Settings(), session=session, cache=CacheStore(tmp_path))
+    assert "If-None-Match" not in session.sent_headers[-1]
+    assert again == first
+
+
+def test_fetch_feed_records_polling_hints(tmp_path):
+    body = SAMPLE_FEED.replace(
+        "<title>Example Feed</title>",
+        "<title>Example Feed</title><ttl>90</ttl><skipHours><hour>1</hour><hour>2</hour></skipHours>",
+    )
+
+    class HintSession(DummySession):
+        def get(self, *_args, **_kwargs):
+            return DummyResponse(self.content, headers={"Cache-Control": "public, max-age=600"})
+
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    cache = CacheStore(tmp_path)
+    fetch_feed(feed, Settings(), session=HintSession(body), cache=cache)
+    state = cache.feed_state(feed.url)
+    assert state["ttl_s"] == 90 * 60
+    assert state["skip_hours"] == [1, 2]
+    assert state["fresh_until"] > state["last_fetch"]
+    assert state["changed"] is True
+
+
+def test_fetch_feed_skips_parse_for_identical_body(tmp_path, monkeypatch):
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    settings = Settings()
+    cache = CacheStore(tmp_path)
+    first = fetch_feed(feed, settings, session=DummySession(SAMPLE_FEED), cache=cache)
+    cache.flush()
+
+    def fail_parse(*_args, **_kwargs):
+        raise AssertionError("feedparser should not run for an unchanged body")
+
+    monkeypatch.setattr("news.feeds.feedparser.parse", fail_parse)
+    again = fetch_feed(feed, settings, session=DummySession(SAMPLE_FEED), cache=cache)
+    assert [item.link for item in again] == [item.link for item in first]
+    assert cache.feed_state(feed.url)["changed"] is False
+    # A fresh process serves the persisted items, still without re-parsing.
+    fresh = fetch_feed(feed, settings, session=DummySession(SAMPLE_FEED), cache=CacheStore(tmp_path))
+    assert fresh == first
+
+
+def test_fetch_feed_backs_off_exponentially_between_retries(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr("news.feeds.time.sleep", sleeps.append)
+    monkeypatch.setattr("news.feeds.random.uniform", lambda low, high: high)
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    settings = Settings(retry_backoff_s=2.0, retry_backoff_max_s=5.0, retry_backoff_budget_s=30.0)
+    items = fetch_feed(feed, settings, session=DummySession(SAMPLE_FEED, failures=3), max_retries=3)
+    assert len(items) == 2
+    assert sleeps == [2.0, 4.0, 5.0]
+
+
+def test_fetch_feed_caps_total_backoff_per_feed(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr("news.feeds.time.sleep", sleeps.append)
+    monkeypatch.setattr("news.feeds.random.uniform", lambda low, high: high)
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    settings = Settings(retry_backoff_s=2.0, retry_backoff_max_s=5.0, retry_backoff_budget_s=7.0)
+    with pytest.raises(FeedError):
+        fetch_feed(feed, settings, session=ErrorSession(SAMPLE_FEED), max_retries=5)
+    # The third wait is cut to what is left of the budget; then the feed gives up.
+    assert sleeps == [2.0, 4.0, 1.0]
+
+
+def test_fetch_feed_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr("news.feeds.time.sleep", lambda _s: pytest.fail("4xx should not be retried"))
+
+    class NotFoundSession(DummySession):
+        calls = 0
+
+        def get(self, *_args, **_kwargs):
+            self.calls += 1
+            response = requests.Response()
+            response.status_code = 404
+            response.raw = io.BytesIO()
+            raise requests.HTTPError("404", response=response)
+
+    session = NotFoundSession(SAMPLE_FEED)
+    with pytest.raises(FeedError):
+        fetch_feed(FeedConfig(name="Example", url="https://example.com/rss"), Settings(), session=session)
+    assert session.calls == 1
+
+
+def test_circuit_breaker_skips_failing_feed_until_cooldown(tmp_path, monkeypatch):
+    monkeypatch.setattr("news.feeds.time.sleep", lambda _s: None)
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    settings = Settings(breaker_threshold=2, breaker_cooldown="10m")
+    cache = CacheStore(tmp_path)
+    for _ in range(2):
+        with pytest.raises(FeedError):
+            fetch_feed(feed, settings, session=ErrorSession(SAMPLE_FEED), cache=cache, max_retries=0)
+    assert cache.feed_state(feed.url)["breaker_open_until"]
+
+    class MustNotCall(DummySession):
+        def get(self, *_args, **_kwargs):
+            raise AssertionError("open circuit must not hit the network")
+
+    with pytest.raises(FeedError, match="Circuit open"):
+        fetch_feed(feed, settings, session=MustNotCall(SAMPLE_FEED), cache=cache)
+
+    cache.update_feed_state(feed.url, breaker_open_until="2000-01-01T00:00:00+00:00")
+    assert len(fetch_feed(feed, settings, session=DummySession(SAMPLE_FEED), cache=cache)) == 2
+    state = cache.feed_state(feed.url)
+    assert "failures" not in state and "breaker_open_until" not in state
+
+
+@pytest.mark.parametrize("early_abort", [True, False])
+def test_fetch_feed_rejects_oversized_body(tmp_path, early_abort):
+    class BigResponse(DummyResponse):
+        consumed = 0
+
+        def iter_content(self, chunk_size=1):
+            for chunk in super().iter_content(chunk_size=16):
+                BigResponse.consumed += len(chunk)
+                yield chunk
+
+    class BigSession(DummySession):
+        def get(self, *_args, **_kwargs):
+            return BigResponse(self.content, headers={"Content-Length": str(len(self.content))})
+
+    feed = FeedConfig(name="Huge", url="https://example.com/huge", max_bytes=100)
+    settings = Settings(early_abort_oversize=early_abort)
+    cache = CacheStore(tmp_path)
+    with pytest.raises(FeedTooLargeError):
+        fetch_feed(feed, settings, session=BigSession(SAMPLE_FEED), cache=cache)
+    assert BigResponse.consumed == (0 if early_abort else 112)
+    assert cache.feed_state(feed.url)["failures"] == 1
+    items = fetch_all_feeds([feed], settings, session_factory=lambda: BigSession(SAMPLE_FEED))
+    assert items == []
+
+
+def test_undated_feed_changes_only_when_entries_change(tmp_path):
+    feed = FeedConfig(name="Example", url="https://example.com/rss")
+    cache = CacheStore(tmp_path)
+
+    def fetch(build_date: str, body: str = SAMPLE_FEED) -> bool:
+        channel = f"<title>Example Feed</title><lastBuildDate>{build_date}</lastBuildDate>"
+        stamped = body.replace("<title>Example Feed</title>", channel)
+        fetch_feed(feed, Settings(), session=DummySession(stamped), cache=cache)
+        return cache.feed_state(feed.url)["changed"]
+
+    assert fetch("Mon, 01 Jan 2024 00:00:00 GMT") is True
+    assert fetch("Mon, 01 Jan 2024 00:05:00 GMT") is False
+    assert fetch("Mon, 01 Jan 2024 00:10:00 GMT", SAMPLE_FEED.replace("Story Two", "Story Three")) is True
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from news.links import canonical_link, link_host
+
+
+def test_canonical_link_drops_tracking_params_scheme_and_trailing_slash():
+    assert canonical_link("https://News.Example.com/a/b/?utm_source=rss&id=7&fbclid=x") == "news.example.com/a/b?id=7"
+    assert canonical_link("http://example.com") == "example.com/"
+    assert canonical_link("urn:uuid:1234") == ""
+    assert canonical_link("http://[::1") == ""
+
+
+def test_news_item_memoizes_canonical_link(make_item, monkeypatch):
+    item = make_item(link="https://example.com/story/?utm_term=x")
+    assert item.link_key() == "example.com/story"
+    assert link_host(item.link_key()) == "example.com"
+
+    monkeypatch.setattr("news.links.canonical_link", lambda _link: "recomputed")
+    assert item.link_key() == "example.com/story"
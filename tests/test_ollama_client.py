@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import json
+import time
+from dataclasses import replace
+from datetime import timedelta
+
 import pytest
 import requests
 
 from news.models import Cluster
-from news.ollama_client import OllamaClient, OllamaConfig, OllamaError
+from news.ollama_client import OllamaClient, OllamaConfig, OllamaError, build_client
 
 
 class DummyResponse:
@@ -53,3 +58,118 @@ def test_summarize_cluster_handles_missing_response(monkeypatch, make_item):
     cluster = Cluster(cluster_id="c1", items=[make_item()], score=1.0)
     with pytest.raises(OllamaError):
         client.summarize_cluster(cluster, cluster.items)
+
+
+def test_client_uses_shared_session(make_item):
+    class RecordingSession:
+        def __init__(self):
+            self.calls: list[str] = []
+
+        def get(self, url, timeout):  # noqa: ARG002
+            self.calls.append(url)
+            return DummyResponse({"models": [{"name": "phi3"}]})
+
+        def post(self, url, json, timeout):  # noqa: ARG002
+            self.calls.append(url)
+            return DummyResponse({"response": "Shared"})
+
+    session = RecordingSession()
+    client = OllamaClient(OllamaConfig(base_url="http://localhost:11434", model="phi3", timeout_s=10), session=session)
+    cluster = Cluster(cluster_id="c1", items=[make_item()], score=1.0)
+    assert client.is_available()
+    assert client.summarize_cluster(cluster, cluster.items) == "Shared"
+    assert session.calls == ["http://localhost:11434/api/tags", "http://localhost:11434/api/generate"]
+
+
+class StreamingResponse:
+    def __init__(self, chunks, delay=0.0):
+        self._chunks = chunks
+        self._delay = delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return None
+
+    def raise_for_status(self):
+        return None
+
+    def iter_lines(self, chunk_size=None):  # noqa: ARG002
+        for chunk in self._chunks:
+            time.sleep(self._delay)
+            yield json.dumps(chunk).encode()
+
+
+def test_summarize_cluster_streams_tokens_and_honors_deadline(make_item):
+    class StreamingSession:
+        def __init__(self, response):
+            self.response = response
+            self.payloads = []
+
+        def post(self, url, json, timeout, stream):  # noqa: ARG002
+            assert stream is True
+            self.payloads.append(json)
+            return self.response
+
+    chunks = [{"response": "What happened: ", "done": False}, {"response": "X.", "done": False}, {"done": True}]
+    session = StreamingSession(StreamingResponse(chunks))
+    config = OllamaConfig(base_url="http://localhost:11434", model="phi3", timeout_s=10, stream=True)
+    client = OllamaClient(config, session=session)
+    cluster = Cluster(cluster_id="c1", items=[make_item()], score=1.0)
+    tokens: list[str] = []
+    assert client.summarize_cluster(cluster, cluster.items, on_token=tokens.append) == "What happened: X."
+    assert tokens == ["What happened: ", "X."]
+    assert session.payloads[0]["stream"] is True
+
+    slow = StreamingSession(StreamingResponse([{"response": "tok", "done": False}] * 10, delay=0.02))
+    config = OllamaConfig(
+        base_url="http://localhost:11434", model="phi3", timeout_s=10, stream=True, token_deadline_s=0.05
+    )
+    with pytest.raises(OllamaError, match="deadline"):
+        OllamaClient(config, session=slow).summarize_cluster(cluster, cluster.items)
+
+
+def test_warm_up_and_keep_alive_payloads(make_item):
+    class RecordingSession:
+        def __init__(self):
+            self.payloads: list[dict] = []
+
+        def post(self, url, json, timeout):  # noqa: ARG002
+            self.payloads.append(json)
+            return DummyResponse({"response": "ok", "embeddings": [[1.0]]})
+
+    session = RecordingSession()
+    config = OllamaConfig(base_url="http://localhost:11434", model="phi3", timeout_s=10, keep_alive="30m")
+    client = OllamaClient(config, session=session)
+    client.start_warm_up().join(timeout=5)
+    cluster = Cluster(cluster_id="c1", items=[make_item()], score=1.0)
+    client.summarize_cluster(cluster, cluster.items)
+    client.embed(["text"])
+    assert session.payloads[0] == {"model": "phi3", "keep_alive": "30m"}
+    assert all(payload["keep_alive"] == "30m" for payload in session.payloads)
+
+    OllamaClient(replace(config, keep_alive=-1), session=session).warm_up()
+    assert '"keep_alive": -1' in json.dumps(session.payloads[-1])
+
+
+def test_build_client_caches_availability_for_ttl(tmp_path):
+    class CountingSession:
+        def __init__(self):
+            self.checks = 0
+
+        def get(self, url, timeout):  # noqa: ARG002
+            self.checks += 1
+            return DummyResponse({"models": [{"name": "phi3"}]})
+
+    session = CountingSession()
+    config = OllamaConfig(base_url="http://localhost:11434", model="phi3", timeout_s=10)
+    status = tmp_path / "ollama_status.json"
+    ttl = timedelta(minutes=10)
+    for _ in range(3):
+        assert build_client(config, session=session, status_path=status, status_ttl=ttl)
+    assert session.checks == 1
+    assert build_client(replace(config, model="llama3"), session=session, status_path=status, status_ttl=ttl)
+    assert session.checks == 2
+    assert build_client(config, session=session)
+    assert session.checks == 3
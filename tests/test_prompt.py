@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+
+from news.models import Cluster
+from news.ollama_client import OllamaClient, OllamaConfig
+from news.prompt import build_cluster_prompt, estimate_tokens, strip_markup
+
+
+def test_prompt_strips_markup_links_and_repeated_sentences(make_item):
+    items = [
+        make_item(
+            id="1",
+            title="Quake hits Chile",
+            link="https://example.com/quake?utm_source=rss",
+            source="AP",
+            summary="<p>Quake hits Chile.</p><p>A magnitude 7.1 quake struck on Monday. Three people died.</p>",
+        ),
+        make_item(
+            id="2",
+            title="Chile earthquake kills three",
+            link="https://example.org/chile",
+            source="Reuters",
+            summary="A magnitude 7.1 quake struck on Monday. Ports reopened &amp; warnings lifted.",
+        ),
+    ]
+    prompt = build_cluster_prompt(Cluster(cluster_id="c1", items=items), items)
+    assert "What happened:" in prompt and "Sources:" in prompt
+    assert "<p>" not in prompt and "https://" not in prompt and "&amp;" not in prompt
+    assert prompt.count("A magnitude 7.1 quake struck on Monday.") == 1
+    assert prompt.count("Quake hits Chile") == 1
+    assert "Ports reopened & warnings lifted." in prompt
+
+
+def test_prompt_fits_budget_and_keeps_every_title(make_item):
+    items = [
+        make_item(id=str(i), title=f"Story {i}", summary=" ".join(f"Fact {i}-{n} is here." for n in range(40)))
+        for i in range(5)
+    ]
+    prompt = build_cluster_prompt(Cluster(cluster_id="c1", items=items), items, token_budget=200)
+    assert estimate_tokens(prompt) <= 200
+    assert all(f"Story {i} (Example)" in prompt for i in range(5))
+    assert all(f"Fact {i}-0 is here." in prompt for i in range(5))
+    assert strip_markup("<b>a</b>\n\n b") == "a b"
+
+    # Titles alone over the budget: all of them stay, summaries are left out.
+    wordy = [make_item(id=str(i), title=f"Story {i} " + "headline word " * 20, summary="Fact.") for i in range(5)]
+    tight = build_cluster_prompt(Cluster(cluster_id="c1", items=wordy), wordy, token_budget=128)
+    assert all(f"Story {i} headline" in tight for i in range(5))
+    assert "Fact." not in tight
+
+
+def test_prompt_keeps_each_lede_contiguous(make_item):
+    long_sentence = "The committee published a very long statement " + "with many more details " * 8 + "today."
+    item = make_item(title="Report", summary=f"Opening line here. {long_sentence} Short tail.")
+    prompt = build_cluster_prompt(Cluster(cluster_id="c1", items=[item]), [item], token_budget=75)
+    assert "Opening line here." in prompt
+    assert "Short tail." not in prompt
+
+
+def test_generation_options_and_prompt_token_log(make_item, caplog):
+    class RecordingSession:
+        def __init__(self):
+            self.payloads: list[dict] = []
+
+        def post(self, url, json, timeout):  # noqa: ARG002
+            self.payloads.append(json)
+            return _Response({"response": "ok", "prompt_eval_count": 123})
+
+    session = RecordingSession()
+    config = OllamaConfig(base_url="http://x", model="phi3", timeout_s=5, num_ctx=2048, num_predict=320)
+    client = OllamaClient(config, session=session)
+    cluster = Cluster(cluster_id="c1", items=[make_item()])
+    with caplog.at_level(logging.INFO, logger="news.ollama_client"):
+        client.warm_up()
+        client.summarize_cluster(cluster, cluster.items)
+    assert [payload["options"] for payload in session.payloads] == [{"num_ctx": 2048, "num_predict": 320}] * 2
+    assert "Prompt for cluster c1: 123 tokens (budget 768)" in caplog.text
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._payload
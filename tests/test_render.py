@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 
 import news.render as render
 from news.models import Cluster, NewsItem
+from news.telemetry import FeedStatsSummary
 
 
 def test_format_timestamp_with_value():
@@ -32,3 +33,48 @@ def test_print_clusters_limits_items(capsys):
     render.print_clusters([cluster], max_items=3)
     captured = capsys.readouterr().out
     assert "Story 0" in captured and "Story 3" not in captured
+
+
+def test_print_feed_stats_renders_rows(capsys):
+    render.set_color(False)
+    summary = FeedStatsSummary(
+        feed="Slow",
+        url="https://slow/rss",
+        samples=4,
+        errors=1,
+        p50_latency_s=0.5,
+        p95_latency_s=1.25,
+        p50_bytes=2048,
+        p95_bytes=4096,
+        p50_parse_s=0.02,
+        avg_items=12.0,
+    )
+    render.print_feed_stats([summary])
+    captured = capsys.readouterr().out
+    assert "Slow" in captured and "1250" in captured and "4.0" in captured
+
+
+def test_live_printer_streams_in_cluster_order(capsys):
+    render.set_color(False)
+    clusters = [
+        Cluster(
+            cluster_id=f"c{i}",
+            items=[NewsItem(id=str(i), title=f"Story {i}", link=f"https://e/{i}", source="Src", tags=[], authors=[])],
+        )
+        for i in range(3)
+    ]
+    printer = render.LiveClusterPrinter()
+    printer.begin(clusters)
+    printer.token(1, "second ")
+    printer.token(0, "first ")
+    early = capsys.readouterr().out
+    assert "first" in early and "second" not in early
+    printer.token(1, "summary")
+    printer.finish(1, "second summary")
+    printer.token(2, "abandoned")
+    printer.finish(2, "What happened: local")
+    printer.token(0, "summary")
+    printer.finish(0, "first summary")
+    out = early + capsys.readouterr().out
+    assert out.index("first summary") < out.index("Cluster 2:") < out.index("second summary") < out.index("Cluster 3:")
+    assert out.index("abandoned") < out.index("generation stopped early") < out.index("What happened: local")
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from news.cache import CacheStore
+from news.config import FeedConfig
+from news.schedule import FeedScheduler
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+FAST = FeedConfig(name="Fast", url="https://fast.example.com/rss")
+SLOW = FeedConfig(name="Slow", url="https://slow.example.com/rss")
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return FeedScheduler(
+        CacheStore(tmp_path),
+        base_interval=timedelta(minutes=30),
+        min_interval=timedelta(minutes=5),
+        max_interval=timedelta(hours=6),
+    )
+
+
+def _interval(scheduler: FeedScheduler, feed: FeedConfig) -> timedelta:
+    return timedelta(seconds=scheduler.cache.feed_state(feed.url)["poll_interval_s"])
+
+
+def test_new_feeds_are_due_immediately(scheduler):
+    assert scheduler.due_feeds([FAST, SLOW], now=NOW) == [FAST, SLOW]
+
+
+def test_changing_feed_polls_faster_than_stale_feed(scheduler):
+    scheduler.cache.update_feed_state(FAST.url, changed=True)
+    scheduler.cache.update_feed_state(SLOW.url, changed=False)
+    scheduler.record([FAST, SLOW], now=NOW)
+    assert _interval(scheduler, FAST) == timedelta(minutes=15)
+    assert _interval(scheduler, SLOW) == timedelta(minutes=45)
+    assert scheduler.due_feeds([FAST, SLOW], now=NOW + timedelta(minutes=20)) == [FAST]
+    assert scheduler.seconds_until_next([FAST, SLOW], now=NOW) == 15 * 60
+
+
+def test_failures_back_off_exponentially(scheduler):
+    scheduler.cache.update_feed_state(FAST.url, failures=3)
+    scheduler.record([FAST], now=NOW)
+    assert _interval(scheduler, FAST) == timedelta(hours=4)
+
+
+def test_publisher_hints_are_floors(scheduler):
+    fresh_until = (NOW + timedelta(hours=2)).isoformat()
+    scheduler.cache.update_feed_state(FAST.url, changed=True, ttl_s=3600, fresh_until=fresh_until)
+    scheduler.record([FAST], now=NOW)
+    assert _interval(scheduler, FAST) == timedelta(hours=2)
+
+
+def test_skip_hours_defer_next_poll(scheduler):
+    scheduler.cache.update_feed_state(FAST.url, changed=True, skip_hours=[12, 13])
+    scheduler.record([FAST], now=NOW)
+    assert scheduler.next_due(FAST) == datetime(2024, 1, 1, 14, 0, tzinfo=timezone.utc)
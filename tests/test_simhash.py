@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+
+from news.simhash import SimHashIndex, hamming, simhash
+
+WIRE = (
+    "WASHINGTON (AP) — The Senate on Tuesday passed a sweeping bill to fund the government through "
+    "September, averting a shutdown hours before the midnight deadline. The measure now heads to the "
+    "president, who is expected to sign it later this week after months of negotiations."
+)
+
+
+def test_simhash_is_close_for_syndicated_copies():
+    copy = WIRE.replace("(AP) —", "(Reuters) -")
+    other = "The central bank held interest rates steady on Wednesday, citing cooling inflation and jobs data."
+    assert hamming(simhash(WIRE), simhash(copy)) <= 3
+    assert hamming(simhash(WIRE), simhash(other)) > 10
+    assert simhash("Read more") == 0
+
+
+def test_simhash_ignores_markup_links_and_template_fields():
+    template = '<p>Article URL: <a href="https://apnews.com/x">https://apnews.com/x</a></p><p>Points: 41</p>'
+    assert simhash(f"<p>{WIRE}</p>{template}") == simhash(WIRE)
+    assert simhash(f"{template}<p>Comments URL: https://news.ycombinator.com/item?id=1</p>") == 0
+
+
+def test_index_matches_brute_force_scan():
+    rng = random.Random(7)
+    stored = [rng.getrandbits(64) for _ in range(300)]
+    # Near neighbours of a few stored fingerprints, 0-5 bits away.
+    queries = [fp ^ sum(1 << bit for bit in rng.sample(range(64), rng.randrange(6))) for fp in stored[:40]]
+    queries += [rng.getrandbits(64) for _ in range(20)]
+
+    index = SimHashIndex(3)
+    for key, fingerprint in enumerate(stored):
+        index.add(key, fingerprint)
+    index.remove(0)
+
+    for query in queries:
+        expected = {key for key, fp in enumerate(stored) if key and hamming(query, fp) <= 3}
+        assert set(index.near(query)) == expected
+        assert index.has_near(query) == bool(expected)
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
 from news.cache import CacheStore
+from news.cluster import ClusterStore
 from news.config import AppConfig, Settings
+from news.dedupe import DedupeIndex
 from news.models import Cluster, FilterOptions, PipelineOptions
-from news.summarize import build_local_summary, run_pipeline, select_representative_items
+from news.ollama_client import OllamaError
+from news.summarize import (
+    _summarize_clusters,
+    build_local_summary,
+    run_pipeline,
+    select_representative_items,
+)
 
 
 def test_select_representative_items_prefers_recent(make_item):
@@ -37,14 +48,14 @@ def test_run_pipeline_respects_cache(tmp_path, make_item, monkeypatch):
     items = [make_item(id="1", link="https://example.com/a"), make_item(id="2", link="https://example.com/b")]
 
     monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, **kwargs: items)
-    monkeypatch.setattr("news.summarize.dedupe_items", lambda data: data)
+    monkeypatch.setattr("news.summarize.dedupe_items", lambda data, **_kwargs: data)
     monkeypatch.setattr("news.summarize.apply_filters", lambda data, opts: data)
     monkeypatch.setattr(
         "news.cluster.cluster_items",
         lambda items, similarity_threshold, max_items: [Cluster(cluster_id="c1", items=list(items), keywords=[])],
     )
 
-    monkeypatch.setattr("news.summarize._summarize_clusters", lambda clusters, llm, reporter=None: False)
+    monkeypatch.setattr("news.summarize._summarize_clusters", lambda clusters, llm, **_kwargs: False)
 
     options = PipelineOptions(filters=FilterOptions())
     first = run_pipeline(config, cache, options)
@@ -52,3 +63,145 @@ def test_run_pipeline_respects_cache(tmp_path, make_item, monkeypatch):
 
     second = run_pipeline(config, cache, options)
     assert len(second.items) == 0
+
+
+def test_run_pipeline_streaming_matches_batch_and_stops_early(tmp_path, make_item, monkeypatch):
+    config = AppConfig(settings=Settings(cache_dir=str(tmp_path / ".cache")), feeds=[])
+    items = [
+        make_item(id="1", title="Chip launch", link="https://example.com/a"),
+        make_item(id="2", title="Chip launch", link="https://example.com/a?utm_source=rss"),
+        make_item(id="3", title="Election results", link="https://example.com/b"),
+        make_item(id="4", title="Weather warning", link="https://example.com/c"),
+    ]
+    pulled: list[str] = []
+    events: list[str] = []
+
+    def fake_iter_all_feeds(*_args, **_kwargs):
+        try:
+            for item in items:
+                pulled.append(item.id)
+                yield item
+        finally:
+            events.append("fetch closed")
+
+    def fake_cluster_items(items, **_kwargs):
+        events.append("cluster")
+        return []
+
+    monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, **kwargs: list(items))
+    monkeypatch.setattr("news.summarize.iter_all_feeds", fake_iter_all_feeds)
+    monkeypatch.setattr("news.summarize._summarize_clusters", lambda clusters, llm, **_kwargs: False)
+
+    options = PipelineOptions(filters=FilterOptions(max_items=2), max_items=2, llm_enabled=False)
+    batch = run_pipeline(config, CacheStore(tmp_path / "batch"), options)
+    streamed = run_pipeline(config, CacheStore(tmp_path / "stream"), replace(options, stream=True))
+    assert [item.id for item in streamed.items] == [item.id for item in batch.items] == ["1", "3"]
+    assert pulled == ["1", "2", "3"]
+
+    events.clear()
+    monkeypatch.setattr("news.summarize.cluster_items", fake_cluster_items)
+    run_pipeline(config, CacheStore(tmp_path / "stream-order"), replace(options, stream=True))
+    assert events == ["fetch closed", "cluster"]
+
+
+def test_run_pipeline_checks_cache_before_fuzzy_dedupe(tmp_path, make_item, monkeypatch):
+    config = AppConfig(settings=Settings(cache_dir=str(tmp_path / ".cache")), feeds=[])
+    cache = CacheStore(tmp_path)
+    seen = make_item(id="1", link="https://example.com/seen")
+    fresh = make_item(id="2", title="Fresh story", link="https://example.com/fresh")
+    cache.mark_items([seen])
+    deduped_inputs: list[list[str]] = []
+
+    def fake_dedupe(data, **_kwargs):
+        deduped_inputs.append([item.id for item in data])
+        return list(data)
+
+    monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, **kwargs: [seen, fresh])
+    monkeypatch.setattr("news.summarize.dedupe_items", fake_dedupe)
+    monkeypatch.setattr("news.summarize._summarize_clusters", lambda clusters, llm, **_kwargs: False)
+
+    index = DedupeIndex(tmp_path)
+    result = run_pipeline(config, cache, PipelineOptions(filters=FilterOptions()), dedupe_index=index)
+    assert deduped_inputs == [["2"]]
+    assert [item.id for item in result.items] == ["2"]
+    assert index.has_link("example.com/fresh")
+
+
+def test_run_pipeline_only_resummarizes_changed_clusters(tmp_path, make_item, monkeypatch):
+    config = AppConfig(settings=Settings(cache_dir=str(tmp_path / ".cache")), feeds=[])
+    cache = CacheStore(tmp_path)
+    store = ClusterStore(tmp_path, window=timedelta(days=2))
+    runs = [
+        [
+            make_item(id="1", title="Nvidia unveils AI chip", summary="Nvidia chip", link="https://a/1"),
+            make_item(id="2", title="Storm hits coast", summary="Weather alert", link="https://a/2"),
+        ],
+        [make_item(id="3", title="Nvidia AI chip ships", summary="Nvidia chip", link="https://a/3")],
+    ]
+    summarized: list[list[str]] = []
+
+    def fake_summarize(clusters, llm, **_kwargs):
+        summarized.append([cluster.cluster_id for cluster in clusters])
+        return False
+
+    monkeypatch.setattr("news.summarize._summarize_clusters", fake_summarize)
+    options = PipelineOptions(filters=FilterOptions(), threshold=0.3)
+    for items in runs:
+        monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, items=items, **kwargs: items)
+        result = run_pipeline(config, cache, options, cluster_store=store)
+
+    assert len(summarized[0]) == 2
+    assert summarized[1] == [summarized[0][0]]
+    assert [item.id for item in result.clusters[0].items] == ["1", "3"]
+
+
+def test_replay_large_enough_to_shard_bypasses_the_cluster_store(tmp_path, make_item, monkeypatch):
+    monkeypatch.setattr("news.cluster.MIN_SHARD_ITEMS", 2)
+    config = AppConfig(settings=Settings(cache_dir=str(tmp_path / ".cache"), cluster_workers=2), feeds=[])
+    store = ClusterStore(tmp_path, window=timedelta(days=2))
+    items = [make_item(id=str(idx), title=f"Story {idx}", link=f"https://a/{idx}") for idx in range(4)]
+    monkeypatch.setattr("news.summarize.fetch_all_feeds", lambda *args, **kwargs: items)
+    monkeypatch.setattr("news.summarize._summarize_clusters", lambda clusters, llm, **_kwargs: False)
+    messages: list[str] = []
+
+    result = run_pipeline(
+        config,
+        CacheStore(tmp_path),
+        PipelineOptions(filters=FilterOptions()),
+        reporter=messages.append,
+        cluster_store=store,
+    )
+    assert len(store) == 0
+    assert sorted(item.id for cluster in result.clusters for item in cluster.items) == ["0", "1", "2", "3"]
+    assert "Sharding 4 items over 2 workers; live clusters are not updated" in messages
+
+
+def test_summarize_clusters_in_parallel_keeps_order_and_fallback(make_item):
+    class SlowClient:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.in_flight = 0
+            self.peak = 0
+
+        def summarize_cluster(self, cluster, items, **_kwargs):
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight -= 1
+            if cluster.cluster_id == "c2":
+                raise OllamaError("boom")
+            return f"summary {cluster.cluster_id}"
+
+    clusters = [
+        Cluster(cluster_id=f"c{idx}", items=[make_item(id=str(idx), title=f"Story {idx}")], keywords=[])
+        for idx in range(6)
+    ]
+    client = SlowClient()
+    assert _summarize_clusters(clusters, client, parallel=2) is True
+    assert client.peak == 2
+    assert clusters[2].summary.startswith("What happened:")
+    assert [c.summary for i, c in enumerate(clusters) if i != 2] == [
+        f"summary c{i}" for i in range(6) if i != 2
+    ]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+from news.models import Cluster
+from news.ollama_client import OllamaClient, OllamaConfig
+from news.prompt import SUMMARY_CHARS
+from news.summarize import _summarize_clusters
+from news.summary_cache import SummaryCache, summary_key
+
+
+class CountingClient(OllamaClient):
+    def __init__(self, model: str = "phi3", **config):
+        super().__init__(OllamaConfig(base_url="http://localhost:11434", model=model, timeout_s=5, **config))
+        self.calls = 0
+
+    def summarize_cluster(self, cluster, items, **_kwargs):
+        self.calls += 1
+        return f"What happened: {cluster.cluster_id}"
+
+
+def test_summary_key_tracks_model_prompt_and_options():
+    key = summary_key("phi3", "prompt", {"num_ctx": 2048, "num_predict": 320})
+    assert summary_key("phi3", "prompt", {"num_predict": 320, "num_ctx": 2048}) == key
+    assert summary_key("llama3", "prompt", {"num_ctx": 2048, "num_predict": 320}) != key
+    assert summary_key("phi3", "prompt 2", {"num_ctx": 2048, "num_predict": 320}) != key
+    assert summary_key("phi3", "prompt", {"num_ctx": 4096, "num_predict": 320}) != key
+
+
+def test_summary_cache_misses_when_the_prompt_or_options_change(tmp_path, make_item):
+    cache = SummaryCache(tmp_path)
+    long_summary = " ".join(f"Fact {n} is here." for n in range(200))
+    cluster = Cluster(cluster_id="c1", items=[make_item(summary=long_summary)], keywords=[])
+    _summarize_clusters([cluster], CountingClient(), summary_cache=cache)
+    _summarize_clusters([cluster], CountingClient(), summary_cache=cache)
+    _summarize_clusters([cluster], CountingClient(prompt_token_budget=80), summary_cache=cache)
+    _summarize_clusters([cluster], CountingClient(num_predict=64), summary_cache=cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # ClusterStore keeps only the first SUMMARY_CHARS of a summary; the prompt, and so the key, stays the same.
+    stored = Cluster(cluster_id="c1", items=[make_item(summary=long_summary[:SUMMARY_CHARS])], keywords=[])
+    _summarize_clusters([stored], CountingClient(), summary_cache=cache)
+    assert cache.hits == 2
+
+
+def test_summary_cache_serves_hits_across_runs(tmp_path, make_item):
+    clusters = [Cluster(cluster_id="c1", items=[make_item()], keywords=[])]
+    client = CountingClient()
+    cache = SummaryCache(tmp_path)
+    assert _summarize_clusters(clusters, client, summary_cache=cache) is True
+    cache.flush()
+
+    rerun = [Cluster(cluster_id="c9", items=[make_item()], keywords=[])]
+    reloaded = SummaryCache(tmp_path)
+    assert _summarize_clusters(rerun, client, summary_cache=reloaded) is True
+    assert client.calls == 1
+    assert rerun[0].summary == "What happened: c1"
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+    assert reloaded.describe() == "Summary cache 1/1 hits (100%)"
+
+    _summarize_clusters(rerun, CountingClient(model="llama3"), summary_cache=reloaded)
+    assert reloaded.hit_rate == 0.5
+
+
+def test_summary_cache_evicts_by_size_and_ttl(tmp_path):
+    cache = SummaryCache(tmp_path, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+    cache.flush()
+
+    data = json.loads((tmp_path / "summaries.json").read_text())
+    data["b"]["at"] = "2000-01-01T00:00:00+00:00"
+    (tmp_path / "summaries.json").write_text(json.dumps(data))
+    aged = SummaryCache(tmp_path, ttl=timedelta(days=7))
+    assert len(aged) == 1
+    assert aged.get("b") is None
+    assert aged.get("c") == "C"
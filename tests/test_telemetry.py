@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from news.config import FeedConfig, Settings
+from news.feeds import fetch_feed
+from news.telemetry import FetchSample, FetchStatsStore, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([], 95) == 0.0
+
+
+def test_store_keeps_rolling_history(tmp_path):
+    store = FetchStatsStore(tmp_path, history=3)
+    for idx in range(5):
+        store.record(FetchSample(feed="Feed", url="https://example.com/rss", ttfb_s=float(idx), bytes=idx))
+    store.flush()
+    reloaded = FetchStatsStore(tmp_path, history=3)
+    assert [sample.bytes for sample in reloaded.samples("https://example.com/rss")] == [2, 3, 4]
+
+
+def test_urls_fetched_since_only_lists_recent_attempts(tmp_path):
+    store = FetchStatsStore(tmp_path)
+    store.record(FetchSample(feed="Old", url="https://old/rss", at="2024-01-01T00:00:00+00:00"))
+    store.record(FetchSample(feed="New", url="https://new/rss", at="2024-01-02T00:00:00+00:00", status="circuit_open"))
+    assert store.urls_fetched_since(datetime(2024, 1, 1, 12, tzinfo=timezone.utc)) == {"https://new/rss"}
+
+
+def test_summarize_orders_slowest_first_and_counts_errors(tmp_path):
+    store = FetchStatsStore(tmp_path)
+    store.record(FetchSample(feed="Fast", url="https://fast/rss", ttfb_s=0.1, download_s=0.1, bytes=1000, items=5))
+    store.record(FetchSample(feed="Slow", url="https://slow/rss", ttfb_s=2.0, download_s=1.0, bytes=9000, items=3))
+    store.record(FetchSample(feed="Slow", url="https://slow/rss", status="error"))
+    summaries = store.summarize()
+    assert [summary.feed for summary in summaries] == ["Slow", "Fast"]
+    slow = summaries[0]
+    assert slow.samples == 2 and slow.errors == 1
+    assert slow.p95_latency_s == pytest.approx(3.0)
+    assert slow.p50_bytes == 9000
+
+
+def test_unexpected_fetch_exception_is_recorded_as_error(tmp_path):
+    class BrokenSession:
+        def get(self, *_args, **_kwargs):
+            raise ValueError("unexpected")
+
+        def close(self):
+            return None
+
+    store = FetchStatsStore(tmp_path)
+    feed = FeedConfig(name="Broken", url="https://broken/rss")
+    with pytest.raises(ValueError):
+        fetch_feed(feed, Settings(), session=BrokenSession(), telemetry=store)
+    assert [sample.status for sample in store.samples(feed.url)] == ["error"]
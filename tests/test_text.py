@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from news.text import TOKEN_DELIMS, normalize_title, tokenize
+
+
+def _tokenize_by_replace(text: str) -> list[str]:
+    text = text.lower()
+    for delim in TOKEN_DELIMS:
+        text = text.replace(delim, " ")
+    return [token for token in text.split() if len(token) > 2]
+
+
+def test_tokenize_matches_per_delimiter_replace():
+    text = 'Nvidia\'s "new" chip: (AI)\tlaunch!\nPrices [up] {5%}; <b>big</b>, news?\r\x0bend.'
+    assert tokenize(text) == _tokenize_by_replace(text)
+    assert normalize_title("The Nvidia chips launch in the U.S.") == "chip launch nvidia s u"
+
+
+def test_item_features_are_computed_once(make_item, monkeypatch):
+    item = make_item(title="AI chips launch", summary="Nvidia unveils chips", content=None)
+    features = item.features()
+    assert features.blob == "ai chips launch\nnvidia unveils chips"
+    assert features.token_counts == {"chips": 2, "launch": 1, "nvidia": 1, "unveils": 1}
+    assert features.title_key == "ai chip launch"
+
+    monkeypatch.setattr("news.text.tokenize", lambda _text: ["recomputed"])
+    monkeypatch.setattr("news.text.normalize_title", lambda _title: "recomputed")
+    assert item.features() is features
+    assert features.token_counts["chips"] == 2
+    assert features.title_key == "ai chip launch"
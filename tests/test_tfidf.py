@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from news.cluster import cluster_items  # noqa: E402
+from news.tfidf import leader_labels, tfidf_matrix  # noqa: E402
+
+
+def test_blocked_leader_labels_match_row_by_row_scan():
+    rng = random.Random(5)
+    vocab = [f"tok{idx}" for idx in range(30)]
+    vectors = [Counter(rng.choices(vocab, k=6)) for _ in range(200)] + [Counter()]
+    matrix = tfidf_matrix(vectors)
+    for threshold in (0.0, 0.3, 0.6):
+        assert leader_labels(matrix, threshold, block_size=16) == leader_labels(matrix, threshold, block_size=1)
+    labels = leader_labels(matrix, 0.3)
+    assert labels[0] == 0
+    assert max(labels) == len(set(labels)) - 1
+
+
+def test_tfidf_engine_emits_same_cluster_shape(make_item):
+    items = [
+        make_item(id="1", title="AI chip launches", summary="Nvidia unveils new ai chip"),
+        make_item(id="2", title="Nvidia releases AI chip", summary="Chip launch"),
+        make_item(id="3", title="Global economy outlook", summary="IMF update"),
+    ]
+    clusters = cluster_items(items, similarity_threshold=0.3, engine="tfidf")
+    assert [cluster.cluster_id for cluster in clusters] == ["cluster-1", "cluster-2"]
+    assert [item.id for item in clusters[0].items] == ["1", "2"]
+    assert clusters[0].score == 2.0
+    assert clusters[0].keywords == cluster_items(items[:2], similarity_threshold=0.0)[0].keywords
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from news.config import FeedConfig, Settings
+from news.feeds import fetch_all_feeds, fetch_feed
+from news.telemetry import FetchStatsStore
+from news.transport import HttpTransport, build_transport
+
+FEED = b"""<?xml version='1.0'?>
+<rss version='2.0'><channel><title>Local</title>
+<item><title>Local story</title><link>https://example.com/local</link></item>
+</channel></rss>
+"""
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *_args):
+        return None
+
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_reuses_connections_across_runs(feed_server):
+    feeds = [FeedConfig(name=f"Feed {i}", url=f"{feed_server}/feed{i}") for i in range(3)]
+    settings = Settings(fetch_concurrency=1)
+    with build_transport(settings, feeds) as transport:
+        for _ in range(2):
+            items = fetch_all_feeds(feeds, settings, session=transport.session)
+            assert len(items) == 3
+        stats = transport.stats()
+    assert stats.requests == 6
+    assert stats.new_connections == 1
+    assert stats.reused_connections == 5
+
+
+def test_transport_stats_describe():
+    transport = HttpTransport()
+    assert "0 requests" in transport.stats().describe()
+    transport.close()
+
+
+def test_fetch_feed_records_connect_time_only_for_new_connections(feed_server, tmp_path):
+    feed = FeedConfig(name="Local", url=f"{feed_server}/feed")
+    store = FetchStatsStore(tmp_path)
+    with HttpTransport() as transport:
+        for _ in range(2):
+            fetch_feed(feed, Settings(), session=transport.session, telemetry=store)
+    first, second = store.samples(feed.url)
+    assert first.connect_s is not None and first.connect_s >= 0
+    assert second.connect_s is None
+    assert first.bytes == len(FEED) and first.entries == 1 and first.items == 1
+    assert first.ttfb_s is not None and first.parse_s is not None